@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Striker 1945 - scripted gameplay benchmarks
+
+Usage: python benchmark.py [scenario ...] [--output FILE] [--compare OLD.json] [--entity-memory]
+"""
+
+from src.benchmark import main
+
+if __name__ == "__main__":
+    main()
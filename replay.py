@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Striker 1945 - replay playback (headless, uncapped)
+
+Record with STRIKER_RECORD=<dir> python main.py, then:
+Usage: python replay.py FILE [--no-draw] [--profile OUT.prof] [--trace OUT.json] [--slowest N]
+"""
+
+import sys
+from src.replay import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Striker 1945 - batch simulator (many headless sessions across all cores)
+
+Usage: python simulate.py [--sessions N] [--traffic none,steady,burst,pcap:FILE] [--autopilot dodge,sweep,idle]
+                          [--minutes M] [--workers W] [--no-draw] [--output FILE]
+"""
+
+from src.simulation import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from src.movement_patterns import MOVEMENT_PATTERNS, StraightMovement
+from src.attack_patterns import ATTACK_PATTERNS, NoAttack
+from src.config_registry import configs
+
+# Score for destroying each enemy type
+SCORE_VALUES = {
+    'scout': 50,
+    'fighter': 100,
+    'gunship': 150,
+    'interceptor': 120,
+    'bomber': 200,
+    'basic': 75
+}
+DEFAULT_SCORE_VALUE = 50
+
+class EnemyArchetype:
+    """
+    Everything an enemy type needs at spawn time, resolved once: config,
+    pattern classes, shared sprite image, hitbox size and score value.
+    """
+
+    def __init__(self, enemy_type, config, asset_manager):
+        self.enemy_type = enemy_type
+        self.config = config
+        self.asset_manager = asset_manager
+        self.health = config['health']
+        self.score_value = SCORE_VALUES.get(enemy_type, DEFAULT_SCORE_VALUE)
+
+        # Sprite shared by every enemy of this type
+        self.asset_key = config.get('asset_key', 'enemy')
+        self.image = asset_manager.get_image(self.asset_key)
+        if not self.image:
+            # Fallback to basic enemy sprite
+            self.asset_key = 'enemy'
+            self.image = asset_manager.get_image('enemy')
+        self.hitbox = self.image.get_size()
+        # Hit flash ready before the first hit, and on the atlas page next to the sprite
+        asset_manager.atlas.pack([self.image, asset_manager.get_tinted(self.image, 'white')])
+        # Optionally turn the sprite to face its direction of travel (cached rotations)
+        self.face_movement = config.get('face_movement', False)
+
+        # Pattern classes looked up now instead of dispatching on strings per spawn
+        self.movement_config = config['movement']
+        self.movement_class = MOVEMENT_PATTERNS.get(self.movement_config.get('type', 'straight'), StraightMovement)
+        self.attack_config = config['attack']
+        self.attack_class = ATTACK_PATTERNS.get(self.attack_config.get('type', 'none'), NoAttack)
+
+    def create_movement(self):
+        return self.movement_class(self.movement_config)
+
+    def create_attack(self, all_sprites, bullets, hazards=None):
+        return self.attack_class(self.attack_config, all_sprites, bullets, self.asset_manager, hazards)
+
+
+class ArchetypeRegistry:
+    """Compiled archetypes per enemy type for one AssetManager"""
+
+    def __init__(self, asset_manager):
+        self.asset_manager = asset_manager
+        self.archetypes = {}
+        # Compile the configured types up front; others (e.g. fallbacks) on first use
+        for enemy_type in configs.enemy_types():
+            self.get(enemy_type)
+
+    def get(self, enemy_type):
+        archetype = self.archetypes.get(enemy_type)
+        if archetype is None:
+            archetype = EnemyArchetype(enemy_type, configs.enemy(enemy_type), self.asset_manager)
+            self.archetypes[enemy_type] = archetype
+        return archetype
@@ -0,0 +1,105 @@
+import contextlib
+import glob
+import hashlib
+import io
+import mmap
+import os
+import struct
+import pygame
+from src.settings import *
+
+# Bump when the baked file layout or the resize steps change; old entries are then re-baked
+BAKE_VERSION = 1
+# Baked file: width and height, then the RGBA pixels
+HEADER = struct.Struct('<II')
+
+class BakedImageCache:
+    """
+    Images decoded and resized once, then stored on disk at their final size.
+
+    Each entry is a raw RGBA buffer named after the source file, the resize
+    spec and a hash of the source bytes, so editing a PNG (or asking for a
+    different size) bakes a new entry and removes the stale one. Cached
+    entries are mapped with mmap and wrapped by pygame.image.frombuffer,
+    which skips PNG decoding and the smoothscale of large sources.
+    """
+
+    def __init__(self, directory=ASSET_CACHE_DIR, enabled=ASSET_CACHE_ENABLED):
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.baked = 0
+
+    def load(self, path, scale=None, size=None, smooth=False):
+        """
+        Image at path in display format, resized by the scale factor or to
+        size (pygame.transform.smoothscale when smooth, scale otherwise).
+        Raises FileNotFoundError/pygame.error like pygame.image.load.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not self.enabled:
+            return self.bake(data, path, scale, size, smooth)
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        spec = self.spec(scale, size, smooth)
+        digest = hashlib.sha1(data + f'{spec}/{BAKE_VERSION}'.encode()).hexdigest()[:16]
+        cache_path = os.path.join(self.directory, f'{stem}_{spec}_{digest}.rgba')
+
+        image = self.read(cache_path)
+        if image is not None:
+            self.hits += 1
+            return image
+        image = self.bake(data, path, scale, size, smooth)
+        self.write(cache_path, image, f'{stem}_{spec}_*.rgba')
+        return image
+
+    def spec(self, scale, size, smooth):
+        """Resize part of the file name, e.g. 'x0.1s' or '120x160'"""
+        if size:
+            spec = f'{size[0]}x{size[1]}'
+        elif scale:
+            spec = f'x{scale}'
+        else:
+            spec = 'orig'
+        return spec + ('s' if smooth else '')
+
+    def bake(self, data, path, scale, size, smooth):
+        image = pygame.image.load(io.BytesIO(data), path).convert_alpha()
+        if scale:
+            size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        if size:
+            resize = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            image = resize(image, size)
+        return image
+
+    def read(self, cache_path):
+        try:
+            with open(cache_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                width, height = HEADER.unpack_from(mapped)
+                if len(mapped) != HEADER.size + width * height * 4:
+                    return None  # Truncated entry; bake it again
+                with memoryview(mapped) as view, view[HEADER.size:] as pixels:
+                    # convert_alpha copies the pixels, so the mapping can close right after
+                    return pygame.image.frombuffer(pixels, (width, height), 'RGBA').convert_alpha()
+        except (OSError, ValueError, struct.error):
+            return None  # Not baked yet (or unreadable)
+
+    def write(self, cache_path, image, stale_pattern):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for stale in glob.glob(os.path.join(self.directory, stale_pattern)):
+                with contextlib.suppress(FileNotFoundError):  # Another process got there first
+                    os.remove(stale)  # Older bakes of the same source and size
+            temp_path = f'{cache_path}.{os.getpid()}.tmp'  # Simulation workers may bake at the same time
+            with open(temp_path, 'wb') as f:
+                f.write(HEADER.pack(*image.get_size()))
+                f.write(pygame.image.tobytes(image, 'RGBA'))
+            os.replace(temp_path, cache_path)
+            self.baked += 1
+        except OSError as e:
+            print(f"Warning: Could not write baked asset {cache_path}: {e}")
+            self.enabled = False  # Keep decoding normally for the rest of the run
+
+    def stats(self):
+        return {'hits': self.hits, 'baked': self.baked}
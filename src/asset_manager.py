@@ -1,6 +1,55 @@
 import pygame
 import os
 import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from src.settings import *
+from src.tracing import traced
+from src.asset_cache import BakedImageCache
+from src.atlas import SpriteAtlas
+
+# Flash/tint variants: list of (fill color, blend flags) applied to a copy of the image
+TINTS = {
+    'white': [((255, 255, 255), pygame.BLEND_RGB_ADD)],  # Hit flash
+    'red': [((255, 60, 60), pygame.BLEND_RGB_MULT), ((90, 0, 0), pygame.BLEND_RGB_ADD)],
+    'translucent': [((255, 255, 255, 128), pygame.BLEND_RGBA_MULT)],
+}
+
+# Asset groups in load priority order: what the scenario and character screens need comes first
+LOAD_GROUPS = ('fonts', 'characters', 'music', 'images', 'sounds')
+
+class GlyphAtlas:
+    """
+    Characters of one font and color pre-rendered side by side on a single
+    surface, for numbers that change every few frames (score, health).
+    draw() places the glyphs with one Surface.blits call instead of
+    rendering a new text surface.
+    """
+
+    def __init__(self, font, color, chars=GLYPH_ATLAS_CHARS):
+        glyphs = [(char, font.render(char, True, color)) for char in chars]
+        self.height = max(glyph.get_height() for _, glyph in glyphs)
+        self.surface = pygame.Surface((sum(glyph.get_width() for _, glyph in glyphs), self.height), pygame.SRCALPHA)
+        self.areas = {}
+        x = 0
+        for char, glyph in glyphs:
+            self.surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy, alpha included
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+
+    def draw(self, surface, text, pos):
+        """Draw text (atlas characters only) with its top-left at pos and return the covered rect."""
+        x, y = pos
+        blits = []
+        for char in text:
+            area = self.areas[char]
+            blits.append((self.surface, (x, y), area))
+            x += area.width
+        surface.blits(blits, doreturn=False)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
 
 class AssetManager:
     def __init__(self):
@@ -9,9 +58,31 @@ class AssetManager:
         self.fonts = {}
         # 캐릭터 선택 이미지를 저장할 딕셔너리 추가
         self.player_character_images = {}
+        # (image key, quantized angle) -> rotated surface, in LRU order
+        self.rotations = OrderedDict()
+        self.rotation_misses = 0
+        # source surface -> {tint: surface}; entries go away with the source surface
+        self.tints = weakref.WeakKeyDictionary()
+        # (font key, text, color) -> rendered text, in LRU order
+        self.texts = OrderedDict()
+        self.text_misses = 0
+        # (font key, color) -> GlyphAtlas
+        self.glyph_atlases = {}
+        # Decoded, resized images kept on disk between runs
+        self.baked = BakedImageCache()
+        # Small sprites packed onto shared pages for batched blits
+        self.atlas = SpriteAtlas()
+        # Background loading (start_loading): group -> Future, and timings for the startup report
+        self.loaders = {'fonts': self.load_fonts, 'characters': self.load_character_images,
+                        'music': self.load_music, 'images': self.load_sprites, 'sounds': self.load_sounds}
+        self.loading = {}
+        self.load_start = None
+        self.load_times = {}  # group -> (start offset, duration, thread name)
+        self.load_waits = {}  # group -> seconds the game thread blocked on it
         
-    def load_images(self):
-        """Load all game images"""
+    @traced(category='assets')
+    def load_character_images(self):
+        """Load the character selection portraits"""
         image_path = os.path.join('assets', 'images')
         
         if not os.path.exists(image_path):
@@ -23,10 +94,8 @@ class AssetManager:
             try:
                 img_path = os.path.join(image_path, f'{key}.png')
                 if os.path.exists(img_path):
-                    img = pygame.image.load(img_path).convert_alpha()
                     # 선택 화면에서 보여줄 이미지 크기 조절
-                    img = pygame.transform.scale(img, (120, 160))
-                    self.player_character_images[key] = img
+                    self.player_character_images[key] = self.baked.load(img_path, size=(120, 160))
                 else:
                     raise FileNotFoundError(f"{key}.png not found")
             except (pygame.error, FileNotFoundError) as e:
@@ -36,12 +105,20 @@ class AssetManager:
                 placeholder_surf.fill((random.randint(50,200), random.randint(50,200), random.randint(50,200)))
                 self.player_character_images[key] = placeholder_surf
 
+    @traced(category='assets')
+    def load_images(self):
+        """Load all game images"""
+        image_path = os.path.join('assets', 'images')
+        
+        if not os.path.exists(image_path):
+            os.makedirs(image_path)
+            
         # 게임 시작 시 기본 캐릭터 설정
-        self.set_player_character('player1')
+        self.load_player_image('player1')
         
         try:
             if os.path.exists(os.path.join(image_path, 'bullet.png')):
-                self.images['bullet'] = pygame.image.load(os.path.join(image_path, 'bullet.png')).convert_alpha()
+                self.images['bullet'] = self.baked.load(os.path.join(image_path, 'bullet.png'))
             else:
                 raise FileNotFoundError()
         except (pygame.error, FileNotFoundError):
@@ -49,9 +126,19 @@ class AssetManager:
             bullet_surf.fill((255, 255, 0))
             self.images['bullet'] = bullet_surf
             
+        # 적 기본 탄환
+        enemy_bullet_surf = pygame.Surface((6, 6))
+        enemy_bullet_surf.fill((255, 100, 100))
+        self.images['enemy_bullet'] = enemy_bullet_surf
+        
+        # 블루스크린 공격 경고 표시
+        warning_marker_surf = pygame.Surface((10, 10))
+        warning_marker_surf.fill(YELLOW)
+        self.images['warning_marker'] = warning_marker_surf
+            
         try:
             if os.path.exists(os.path.join(image_path, 'enemy.png')):
-                self.images['enemy'] = pygame.image.load(os.path.join(image_path, 'enemy.png')).convert_alpha()
+                self.images['enemy'] = self.baked.load(os.path.join(image_path, 'enemy.png'))
             else:
                 raise FileNotFoundError()
         except (pygame.error, FileNotFoundError):
@@ -70,11 +157,7 @@ class AssetManager:
         for enemy_key, (width, height, color) in enemy_types.items():
             try:
                 if os.path.exists(os.path.join(image_path, f'{enemy_key}.png')):
-                    img = pygame.image.load(os.path.join(image_path, f'{enemy_key}.png')).convert_alpha()
-                    scale_factor = 0.1
-                    new_size = (int(img.get_width() * scale_factor), int(img.get_height() * scale_factor))
-                    img = pygame.transform.smoothscale(img, new_size)
-                    self.images[enemy_key] = img
+                    self.images[enemy_key] = self.baked.load(os.path.join(image_path, f'{enemy_key}.png'), scale=0.1, smooth=True)
                 else:
                     raise FileNotFoundError()
             except (pygame.error, FileNotFoundError):
@@ -91,11 +174,7 @@ class AssetManager:
         
         try:
             if os.path.exists(os.path.join(image_path, 'migamboss.png')):
-                img = pygame.image.load(os.path.join(image_path, 'migamboss.png')).convert_alpha()
-                scale_factor = 0.3
-                new_size = (int(img.get_width() * scale_factor), int(img.get_height() * scale_factor))
-                img = pygame.transform.smoothscale(img, new_size)
-                self.images['migamboss'] = img
+                self.images['migamboss'] = self.baked.load(os.path.join(image_path, 'migamboss.png'), scale=0.3, smooth=True)
             else:
                 boss_surf = pygame.Surface((60, 60), pygame.SRCALPHA)
                 pygame.draw.circle(boss_surf, (255, 0, 255), (30, 30), 30)
@@ -105,22 +184,13 @@ class AssetManager:
             pygame.draw.circle(boss_surf, (255, 0, 255), (30, 30), 30)
             self.images['migamboss'] = boss_surf
             
-        custom_images = {'jesus': (100, 100, (255, 255, 255)), 'tang': (50, 50, (255, 100, 100)), 'bsod': (100, 100, (0, 0, 255))}
-        for key, (width, height, color) in custom_images.items():
+        # jesus는 0.5로 적으려던 값이 오타로 적용되지 않아 보스 배율(0.3)로 그려져 왔으므로 그 크기를 유지합니다
+        custom_images = {'jesus': (100, 100, (255, 255, 255), 0.3), 'tang': (50, 50, (255, 100, 100), 0.35), 'bsod': (100, 100, (0, 0, 255), 0.4)}
+        for key, (width, height, color, scale_factor) in custom_images.items():
             try:
                 img_path = os.path.join(image_path, f"{key}.png")
                 if os.path.exists(img_path):
-                    img = pygame.image.load(img_path).convert_alpha()
-                    if key == "tang":
-                        scale_factor = 0.35
-                    elif key == "jesus":
-                        scale_factloador = 0.5
-                    elif key == "bsod":
-                        scale_factor = 0.4
-                    w, h = img.get_size()
-                    new_size = (int(w * scale_factor), int(h * scale_factor))
-                    img = pygame.transform.scale(img, new_size)
-                    self.images[key] = img
+                    self.images[key] = self.baked.load(img_path, scale=scale_factor)
                 else:
                     raise FileNotFoundError()
             except (pygame.error, FileNotFoundError):
@@ -133,7 +203,7 @@ class AssetManager:
             try:
                 img_path = os.path.join(image_path, f"{key}.png")
                 if os.path.exists(img_path):
-                    self.images[key] = pygame.image.load(img_path).convert_alpha()
+                    self.images[key] = self.baked.load(img_path)
                 else:
                     raise FileNotFoundError()
             except (pygame.error, FileNotFoundError):
@@ -147,8 +217,9 @@ class AssetManager:
                     pygame.draw.circle(surf, color, (8, 24), 4)
                     pygame.draw.circle(surf, color, (width - 8, 24), 4)
                 self.images[key] = surf
-    def load_sounds(self):
-        """Load all sound files."""
+    @traced(category='assets')
+    def load_music(self):
+        """Find the background music (streamed by pygame.mixer.music, so only the path is stored)."""
         sound_path = os.path.join('assets', 'sounds')
         
         if not os.path.exists(sound_path):
@@ -162,6 +233,11 @@ class AssetManager:
         except Exception as e:
             print(f"Error loading background music path: {e}")
 
+    @traced(category='assets')
+    def load_sounds(self):
+        """Load all sound effects."""
+        sound_path = os.path.join('assets', 'sounds')
+
         # 효과음(SFX) 로드 (Sound 객체로 저장)
         sound_files = {
             'shoot': 'shoot.wav',
@@ -190,6 +266,7 @@ class AssetManager:
                 print(f"Error loading sound {filename}: {e}")
                 self.sounds[key] = None
             
+    @traced(category='assets')
     def load_fonts(self):
         font_path = os.path.join('assets', 'fonts')
         if not os.path.exists(font_path): os.makedirs(font_path)
@@ -203,20 +280,177 @@ class AssetManager:
             print(f"경고: 한글 폰트를 불러올 수 없습니다. {e}\n기본 폰트를 사용합니다. (한글이 깨질 수 있습니다)")
             self.fonts['score'] = pygame.font.Font(None, 24)
             self.fonts['title'] = pygame.font.Font(None, 48)
+        # 보스 체력바 이름 (기본 폰트)
+        self.fonts['boss'] = pygame.font.Font(None, 24)
+        
+    def load_sprites(self):
+        """Gameplay images with their preloaded rotations and the sprite atlas"""
+        self.wait_for('characters')  # The default player sprite falls back to its portrait
+        self.load_images()
+        self.preload_rotations()
+        self.build_atlas()
         
+    @traced(category='assets')
     def load_all(self):
-        self.load_images(); self.load_sounds(); self.load_fonts()
+        """Load every group on the calling thread (headless tools)"""
+        for group in LOAD_GROUPS:
+            self.loaders[group]()
+            
+    def start_loading(self, workers=ASSET_LOADER_WORKERS):
+        """
+        Load every group on a thread pool, submitted in LOAD_GROUPS order,
+        and return right away. The getters wait for a group only when they
+        are asked for something it has not loaded yet.
+        """
+        self.load_start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='AssetLoader')
+        for group in LOAD_GROUPS:
+            self.loading[group] = executor.submit(self.run_loader, group)
+        executor.shutdown(wait=False)
+        
+    def run_loader(self, group):
+        start = time.perf_counter()
+        self.loaders[group]()
+        self.load_times[group] = (start - self.load_start, time.perf_counter() - start, threading.current_thread().name)
+        
+    def wait_for(self, group):
+        """Block until a background-loaded group is in (re-raising its error); no-op otherwise"""
+        future = self.loading.get(group)
+        if future is None:
+            return
+        if not future.done() and threading.current_thread() is threading.main_thread():
+            start = time.perf_counter()
+            future.result()
+            self.load_waits[group] = self.load_waits.get(group, 0.0) + time.perf_counter() - start
+        future.result()
+        
+    def loading_done(self):
+        return all(future.done() for future in self.loading.values())
+        
+    def startup_report(self, origin):
+        """Lines describing when each group loaded, in ms after origin (a perf_counter time)"""
+        offset = (self.load_start - origin) * 1000
+        lines = []
+        for group in LOAD_GROUPS:
+            start, duration, thread = self.load_times.get(group, (0.0, 0.0, '-'))
+            waited = self.load_waits.get(group, 0.0) * 1000
+            lines.append(f"  {group:<11} start {offset + start * 1000:7.1f}  took {duration * 1000:7.1f}"
+                         f"  ({thread}){f', game waited {waited:.1f}' if waited else ''}")
+        ready = max((start + duration for start, duration, _ in self.load_times.values()), default=0.0)
+        lines.append(f"  all assets ready at {offset + ready * 1000:.1f} ms; baked images {self.baked.stats()}")
+        return lines
+        
+    def build_atlas(self):
+        """Pack the small sprites (not the player, drawn on its own) and the preloaded rotations"""
+        self.atlas.pack([image for key, image in self.images.items() if key != 'player'] + list(self.rotations.values()))
         
-    def get_image(self, key): return self.images.get(key)
-    def get_sound(self, key): return self.sounds.get(key)
-    def get_font(self, key): return self.fonts.get(key)
+    def preload_rotations(self, angles=PRELOADED_ROTATIONS):
+        """Rotate the known angled sprites up front so gameplay never has to"""
+        for key, key_angles in angles.items():
+            for angle in key_angles:
+                self.get_rotated(key, angle)
+                
+    def get_rotated(self, key, angle):
+        """Image rotated counterclockwise by angle (snapped to ROTATION_STEP), cached"""
+        angle = round(angle / ROTATION_STEP) * ROTATION_STEP % 360
+        if angle == 0:
+            return self.get_image(key)
+        cache_key = (key, angle)
+        image = self.rotations.get(cache_key)
+        if image is not None:
+            self.rotations.move_to_end(cache_key)
+            return image
+        source = self.get_image(key)
+        if source is None:
+            return None
+        image = pygame.transform.rotate(source, angle)
+        self.rotations[cache_key] = image
+        self.rotation_misses += 1
+        if len(self.rotations) > ROTATION_CACHE_SIZE:
+            self.rotations.popitem(last=False)
+        return image
+        
+    def get_text(self, font_key, text, color=WHITE):
+        """Antialiased text rendered once per (font, text, color), cached"""
+        cache_key = (font_key, text, color)
+        surface = self.texts.get(cache_key)
+        if surface is not None:
+            self.texts.move_to_end(cache_key)
+            return surface
+        surface = self.get_font(font_key).render(text, True, color)
+        self.texts[cache_key] = surface
+        self.text_misses += 1
+        if len(self.texts) > TEXT_CACHE_SIZE:
+            self.texts.popitem(last=False)
+        return surface
+
+    def get_glyphs(self, font_key, color=WHITE):
+        """Shared GlyphAtlas for drawing numbers in a font and color"""
+        atlas = self.glyph_atlases.get((font_key, color))
+        if atlas is None:
+            atlas = self.glyph_atlases[(font_key, color)] = GlyphAtlas(self.get_font(font_key), color)
+        return atlas
+
+    def get_facing(self, key, direction, base_direction=(0, 1)):
+        """
+        Image turned so that base_direction (where the source art points,
+        down by default) faces along direction, e.g. an enemy's velocity.
+        """
+        direction = pygame.math.Vector2(direction)
+        if direction.length_squared() == 0:
+            return self.get_image(key)
+        return self.get_rotated(key, -pygame.math.Vector2(base_direction).angle_to(direction))
+        
+    def get_tinted(self, image, tint='white'):
+        """Shared flash/tint variant of a surface, made on first request"""
+        variants = self.tints.get(image)
+        if variants is None:
+            variants = self.tints[image] = {}
+        tinted = variants.get(tint)
+        if tinted is None:
+            # Per-pixel alpha copy so the translucent variant works for opaque images too
+            tinted = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            tinted.blit(image, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy, alpha included
+            for color, flags in TINTS[tint]:
+                tinted.fill(color, special_flags=flags)
+            variants[tint] = tinted
+        return tinted
+        
+    def clear_rotations(self, key):
+        """Drop cached rotations of an image that has been replaced"""
+        for cache_key in [cache_key for cache_key in self.rotations if cache_key[0] == key]:
+            del self.rotations[cache_key]
+        
+    # 아직 불러오는 중인 에셋을 요청하면 그 그룹이 끝날 때까지만 기다립니다
+    def get_image(self, key):
+        image = self.images.get(key)
+        if image is None:
+            self.wait_for('images')
+            image = self.images.get(key)
+        return image
+    
+    def get_sound(self, key):
+        if key not in self.sounds:  # Missing files are stored as None once loaded
+            self.wait_for('music' if key == 'background' else 'sounds')
+        return self.sounds.get(key)
+    
+    def get_font(self, key):
+        font = self.fonts.get(key)
+        if font is None:
+            self.wait_for('fonts')
+            font = self.fonts.get(key)
+        return font
         
     def play_sound(self, key):
-        sound = self.sounds.get(key)
+        sound = self.get_sound(key)
         if sound: sound.play()
             
     def set_player_character(self, character_key):
         """선택된 캐릭터 이미지를 실제 플레이어 이미지로 설정합니다."""
+        self.wait_for('images')  # Otherwise the loader could still set the default character afterwards
+        self.load_player_image(character_key)
+        
+    def load_player_image(self, character_key):
         image_path = os.path.join('assets', 'images')
         original_image = None
         try:
@@ -224,18 +458,18 @@ class AssetManager:
             png_name = 'player.png' if character_key == 'player1' else f'{character_key}.png'
             img_path = os.path.join(image_path, png_name)
             if os.path.exists(img_path):
-                original_image = pygame.image.load(img_path).convert_alpha()
+                # 실제 게임 플레이에 사용될 크기로 최종 조절 (구워 둔 캐시에서)
+                self.images['player'] = self.baked.load(img_path, size=(60, 80))
             else:
                 raise FileNotFoundError
         except (pygame.error, FileNotFoundError):
              # 이미지 로드 실패 시, 미리 로드된 placeholder 사용
-             original_image = self.player_character_images[character_key]
-
-        # 실제 게임 플레이에 사용될 크기로 최종 조절
-        game_size = (60, 80) 
-        self.images['player'] = pygame.transform.scale(original_image, game_size)
+             self.images['player'] = pygame.transform.scale(self.player_character_images[character_key], (60, 80))
+        self.clear_rotations('player')
+        self.player_character = character_key  # Stored in replays
         print(f"플레이어 캐릭터가 '{character_key}'로 설정되었습니다.")
 
     def get_character_image(self, key):
         """캐릭터 선택 화면을 위한 이미지를 가져옵니다."""
+        self.wait_for('characters')
         return self.player_character_images.get(key)
\ No newline at end of file
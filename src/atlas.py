@@ -0,0 +1,62 @@
+import pygame
+from src.settings import *
+
+class SpriteAtlas:
+    """
+    Small sprites packed onto a few shared surfaces (pages).
+
+    areas maps each packed surface to (page, area), so a draw loop can
+    swap (image, dest) for (page, dest, area) and send a whole layer to
+    one Surface.blits call that reads from a handful of pages instead of
+    many scattered surfaces. Surfaces that are not packed (large images,
+    rotations made on demand) are simply missing from areas and drawn
+    from their own surface.
+
+    Only per-pixel alpha sprites are packed: an opaque sprite copied from
+    an alpha page would be alpha-blended on every blit instead of copied.
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, padding=ATLAS_PADDING, max_sprite=ATLAS_MAX_SPRITE):
+        self.page_size = page_size
+        self.padding = padding
+        self.max_sprite = min(max_sprite, page_size)
+        self.pages = []
+        self.areas = {}  # Surface -> (page, Rect on the page)
+        self.x = self.y = self.shelf_height = 0  # Packing cursor on the last page
+
+    def pack(self, images):
+        """Add the small alpha surfaces to the atlas, tallest first onto shelves; returns how many were packed."""
+        size, padding, max_sprite = self.page_size, self.padding, self.max_sprite
+        pending = [image for image in dict.fromkeys(images)
+                   if image not in self.areas and image.get_flags() & pygame.SRCALPHA and max(image.get_size()) <= max_sprite]
+        pending.sort(key=lambda image: image.get_height(), reverse=True)
+        for image in pending:
+            width, height = image.get_size()
+            if self.x + width > size:
+                # Next shelf
+                self.x, self.y, self.shelf_height = 0, self.y + self.shelf_height + padding, 0
+            if not self.pages or self.y + height > size:
+                self.new_page()
+            page = self.pages[-1]
+            # Exact copy, alpha included (the page starts fully transparent)
+            page.blit(image, (self.x, self.y), special_flags=pygame.BLEND_RGBA_MAX)
+            self.areas[image] = (page, pygame.Rect(self.x, self.y, width, height))
+            self.x += width + padding
+            self.shelf_height = max(self.shelf_height, height)
+        return len(pending)
+
+    def new_page(self):
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA)
+        if pygame.display.get_surface():
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self.x = self.y = self.shelf_height = 0
+
+    def source(self, image):
+        """(surface, area) to blit image from: its atlas page, or itself when not packed."""
+        entry = self.areas.get(image)
+        return entry if entry else (image, image.get_rect())
+
+    def stats(self):
+        return {'pages': len(self.pages), 'sprites': len(self.areas)}
@@ -0,0 +1,420 @@
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import pygame
+from src.settings import *
+from src.headless import HeadlessGame
+from src.attack_patterns import WarningPoint
+from src.game_clock import game_clock
+
+FRAME_DT = 1.0 / FPS
+PERCENTILES = (50, 95, 99)
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(samples):
+    """Summarize frame samples (seconds) as milliseconds."""
+    summary = {f"p{pct}": round(percentile(samples, pct) * 1000, 4) for pct in PERCENTILES}
+    summary['mean'] = round(sum(samples) / len(samples) * 1000, 4) if samples else 0.0
+    summary['max'] = round(max(samples) * 1000, 4) if samples else 0.0
+    return summary
+
+
+class Scenario:
+    """Base class for scripted benchmark scenarios"""
+    name = 'base'
+    description = ''
+
+    def setup(self, state):
+        """Prepare a fresh GameplayState before the first frame."""
+        player = state.player
+        # 벤치마크 도중 게임 오버가 되지 않도록 목숨을 충분히 줍니다.
+        player.lives = 10 ** 9
+        # Waves must not end on the game clock while frames are being measured
+        state.wave_manager.wave_duration = float('inf')
+
+    def before_frame(self, state, frame, sim_time):
+        """Script input for this frame. Return the events for handle_events."""
+        return []
+
+
+class WaveScenario(Scenario):
+    """Plays a regular wave, spawning on simulated time instead of wall clock"""
+
+    def __init__(self, name, wave_number, spawn_speedup=1.0, description=''):
+        self.name = name
+        self.wave_number = wave_number
+        self.spawn_speedup = spawn_speedup
+        self.description = description
+
+    def setup(self, state):
+        super().setup(state)
+        state.wave_manager.start_wave(self.wave_number)
+        # Spawning is driven from before_frame
+        state.wave_manager.auto_spawn = False
+        player = state.player
+        player.weapon_level = 3
+        player.shoot_delay = 0
+
+    def before_frame(self, state, frame, sim_time):
+        wave_manager = state.wave_manager
+        for entry in wave_manager.timeline.due(sim_time * 1000 * self.spawn_speedup):
+            wave_manager.spawn_enemy(entry)
+        state.player.shoot()
+        return []
+
+
+class BossPhaseScenario(Scenario):
+    """Holds the boss in a single attack phase for the whole run"""
+
+    def __init__(self, name, boss_wave, phase, description=''):
+        self.name = name
+        self.boss_wave = boss_wave
+        self.phase = phase
+        self.description = description
+
+    def setup(self, state):
+        super().setup(state)
+        wave_manager = state.wave_manager
+        wave_manager.start_wave(self.boss_wave)
+        boss = wave_manager.boss_enemy
+        boss.is_entering = False
+        boss.pos.y = 100
+        boss.rect.center = (round(boss.pos.x), round(boss.pos.y))
+        # A huge health pool parked mid-band keeps target_phase fixed while
+        # the player's bullets still hit it
+        boss.max_health = 10 ** 9
+        boss.health = boss.max_health - boss.max_health / boss.max_phases * (self.phase - 0.5)
+        if boss.phase != self.phase:
+            boss.transition_to_phase(self.phase)
+        boss.invulnerable = False
+        state.player.weapon_level = 3
+        state.player.shoot_delay = 0
+
+    def before_frame(self, state, frame, sim_time):
+        state.player.shoot()
+        return []
+
+
+class BulletFieldScenario(Scenario):
+    """Keeps a fixed number of enemy bullets alive on screen"""
+
+    def __init__(self, name, bullet_count, description=''):
+        self.name = name
+        self.bullet_count = bullet_count
+        self.description = description
+        self.rng = random.Random(1945)
+
+    def setup(self, state):
+        super().setup(state)
+        # Only the bullet field should be on screen
+        state.wave_manager.auto_spawn = False
+        self.rng.seed(1945)
+        for _ in range(self.bullet_count):
+            pos = (self.rng.uniform(0, SCREEN_WIDTH), self.rng.uniform(0, SCREEN_HEIGHT))
+            self.spawn_bullet(state, pos)
+
+    def spawn_bullet(self, state, pos):
+        bullets = state.enemy_bullets
+        velocity = (self.rng.uniform(-60, 60), self.rng.uniform(60, 240))
+        bullets.emit(pos, velocity, bullets.register_image('enemy_bullet', state.game.asset_manager.get_image('enemy_bullet')))
+
+    def before_frame(self, state, frame, sim_time):
+        missing = self.bullet_count - len(state.enemy_bullets)
+        for _ in range(missing):
+            self.spawn_bullet(state, (self.rng.uniform(0, SCREEN_WIDTH), 0))
+        return []
+
+
+class NetworkFloodScenario(Scenario):
+    """Feeds a burst of network spawn events into handle_events every frame"""
+
+    def __init__(self, name, spawns_per_frame, description=''):
+        self.name = name
+        self.spawns_per_frame = spawns_per_frame
+        self.description = description
+        self.enemy_types = list(PACKET_TO_ENEMY_MAP.items())
+
+    def setup(self, state):
+        super().setup(state)
+        state.wave_manager.auto_spawn = False
+
+    def before_frame(self, state, frame, sim_time):
+        events = []
+        for i in range(self.spawns_per_frame):
+            packet_type, enemy_type = self.enemy_types[(frame + i) % len(self.enemy_types)]
+            events.append(pygame.event.Event(ENEMY_SPAWN_EVENT, {
+                'enemy_type': enemy_type,
+                'packet_type': packet_type,
+                'source': 'network'
+            }))
+        return events
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in [
+        WaveScenario('wave_1', 1, description="Wave 1 at its configured spawn rate"),
+        WaveScenario('wave_4_dense', 4, spawn_speedup=4.0, description="Wave 4 spawning four times faster"),
+        BossPhaseScenario('boss_migam_phase_1', 5, 1, description="angry_migam phase 1 (spread_shot_image)"),
+        BossPhaseScenario('boss_migam_phase_2', 5, 2, description="angry_migam phase 2 (fast_forward_shot_image)"),
+        BossPhaseScenario('boss_migam_phase_3', 5, 3, description="angry_migam phase 3 (blue_screen_attack)"),
+        BulletFieldScenario('bullets_500', 500, description="500 concurrent enemy bullets"),
+        BulletFieldScenario('bullets_2000', 2000, description="2000 concurrent enemy bullets"),
+        BulletFieldScenario('bullets_10000', 10000, description="10000 concurrent enemy bullets"),
+        NetworkFloodScenario('network_flood', 8, description="8 network spawn events per frame"),
+    ]
+}
+
+
+# Live entity counts for the bytes-per-entity measurement
+ENTITY_COUNTS = (1000, 10000, 50000)
+
+def spawn_enemies(state, rng, count):
+    archetypes = list(state.archetypes.archetypes.values())
+    for i in range(count):
+        pos = (rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        state.enemy_pool.acquire(pos, archetypes[i % len(archetypes)])
+
+def spawn_powerups(state, rng, count):
+    for _ in range(count):
+        state.spawn_powerup((rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)))
+
+def spawn_warning_points(state, rng, count):
+    groups = [state.all_sprites, state.hazard_group]
+    for _ in range(count):
+        pos = (rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        WarningPoint(pos, 1.0, groups, state.game.asset_manager)
+
+def spawn_enemy_bullets(state, rng, count):
+    bullets = state.enemy_bullets
+    image_id = bullets.register_image('enemy_bullet', state.game.asset_manager.get_image('enemy_bullet'))
+    for _ in range(count):
+        bullets.emit((rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)),
+                     (0, rng.uniform(60, 240)), image_id)
+
+ENTITY_SPAWNERS = {
+    'enemies': spawn_enemies,
+    'powerups': spawn_powerups,
+    'warning_points': spawn_warning_points,
+    'enemy_bullets': spawn_enemy_bullets,
+}
+
+
+class BenchmarkRunner:
+    """Runs scenarios on a headless GameplayState and collects per-frame timings"""
+
+    def __init__(self, frames=600, warmup=30, measure_memory=True):
+        self.frames = frames
+        self.warmup = warmup
+        self.measure_memory = measure_memory
+        self.game = HeadlessGame()
+        # The collision phase timing comes from the frame profiler
+        self.game.profiler.toggle()
+
+    def new_state(self, scenario):
+        random.seed(1945)
+        game_clock.reset()
+        state = self.game.new_gameplay()
+        scenario.setup(state)
+        return state
+
+    def step(self, state, scenario, frame, timings=None):
+        """Advance one frame. Collision time is split out of the update time."""
+        sim_time = frame * FRAME_DT
+        events = scenario.before_frame(state, frame, sim_time)
+        profiler = self.game.profiler
+        profiler.begin_frame()
+
+        game_clock.advance(FRAME_DT)
+        start = time.perf_counter()
+        state.handle_events(events)
+        state.update(FRAME_DT)
+        update_end = time.perf_counter()
+        state.draw(self.game.screen)
+        draw_end = time.perf_counter()
+
+        if timings is not None:
+            # GameplayState.update runs check_collisions itself; split it out
+            collision_time = profiler.phase_times['collisions']
+            timings['update'].append(update_end - start - collision_time)
+            timings['collision'].append(collision_time)
+            timings['draw'].append(draw_end - update_end)
+            timings['frame'].append(draw_end - start)
+
+    def run_scenario(self, scenario):
+        timings = {'update': [], 'collision': [], 'draw': [], 'frame': []}
+
+        # Spawns and boss phases print to stdout; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            state = self.new_state(scenario)
+            peak_entities = state.entity_counts()
+            for frame in range(self.warmup):
+                self.step(state, scenario, frame)
+            for frame in range(self.warmup, self.warmup + self.frames):
+                self.step(state, scenario, frame, timings)
+                for key, count in state.entity_counts().items():
+                    peak_entities[key] = max(peak_entities[key], count)
+
+            memory = None
+            if self.measure_memory:
+                memory = self.measure_peak_memory(scenario)
+
+        result = {
+            'description': scenario.description,
+            'frames': self.frames,
+            'timings_ms': {phase: summarize(samples) for phase, samples in timings.items()},
+            'peak_entities': peak_entities,
+            'pools': state.pool_stats(),
+            'culled': {kind: stats['total'] for kind, stats in state.cull_stats().items()},
+        }
+        if memory is not None:
+            result['memory'] = memory
+        return result
+
+    def measure_peak_memory(self, scenario):
+        """Replay the scenario under tracemalloc (kept out of the timing pass)."""
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            state = self.new_state(scenario)
+            for frame in range(self.warmup + self.frames):
+                self.step(state, scenario, frame)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            'baseline_kb': round(baseline / 1024, 1),
+            'peak_kb': round(peak / 1024, 1),
+            'peak_growth_kb': round((peak - baseline) / 1024, 1),
+        }
+
+    def measure_entity_memory(self, counts=ENTITY_COUNTS):
+        """
+        Python heap bytes per live entity of each kind, at each count.
+        Shared data (images, archetypes, registered bullet images) is loaded
+        before tracing starts, so only per-entity allocations are counted.
+        """
+        results = {}
+        for kind, spawn in ENTITY_SPAWNERS.items():
+            results[kind] = {}
+            for count in counts:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    state = self.game.new_gameplay()
+                    spawn(state, random.Random(1945), 1)  # Warm caches and registries
+                    tracemalloc.start()
+                    try:
+                        baseline, _ = tracemalloc.get_traced_memory()
+                        spawn(state, random.Random(1945), count)
+                        current, _ = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+                results[kind][str(count)] = round((current - baseline) / count, 1)
+            print(f"  {kind:<16}" + ''.join(f"{count:>7}: {size:7.1f} B" for count, size in
+                                            zip(counts, results[kind].values())))
+        return results
+
+    def run(self, names=None):
+        names = list(SCENARIOS) if names is None else names
+        results = {}
+        for name in names:
+            print(f"Running {name}...", flush=True)
+            results[name] = self.run_scenario(SCENARIOS[name])
+            frame = results[name]['timings_ms']['frame']
+            print(f"  frame p50={frame['p50']:.3f}ms p95={frame['p95']:.3f}ms p99={frame['p99']:.3f}ms")
+        return {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': sys.version.split()[0],
+                'pygame': pygame.version.ver,
+                'platform': platform.platform(),
+                'frames': self.frames,
+                'warmup': self.warmup,
+                'frame_dt': FRAME_DT,
+            },
+            'scenarios': results,
+        }
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def load_results(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def compare_results(baseline, current):
+    """Return printable lines comparing p50/p95/p99 between two result files."""
+    lines = [f"{'scenario':<22}{'phase':<11}" + ''.join(f"{'p' + str(p):>24}" for p in PERCENTILES)]
+    for name, result in current['scenarios'].items():
+        old = baseline['scenarios'].get(name)
+        if not old:
+            continue
+        for phase, summary in result['timings_ms'].items():
+            cells = []
+            for pct in PERCENTILES:
+                key = f"p{pct}"
+                before, after = old['timings_ms'][phase][key], summary[key]
+                change = (after - before) / before * 100 if before else 0.0
+                cells.append(f"{before:8.3f}->{after:8.3f} {change:+5.0f}%")
+            lines.append(f"{name:<22}{phase:<11}" + ''.join(f"{cell:>24}" for cell in cells))
+    entity_memory = current.get('entity_memory', {})
+    if entity_memory and baseline.get('entity_memory'):
+        lines.append(f"{'entity':<33}bytes per live entity at each count")
+    for kind, sizes in entity_memory.items():
+        old = baseline.get('entity_memory', {}).get(kind)
+        if not old:
+            continue
+        cells = []
+        for count, after in sizes.items():
+            before = old.get(count, 0.0)
+            change = (after - before) / before * 100 if before else 0.0
+            cells.append(f"{count + ':':>7}{before:7.0f}->{after:5.0f}B {change:+4.0f}%")
+        lines.append(f"{kind:<22}{'bytes':<11}" + ''.join(f"{cell:>26}" for cell in cells))
+    return lines
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Striker 1945 gameplay benchmarks")
+    parser.add_argument('scenarios', nargs='*', help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--frames', type=int, default=600, help="measured frames per scenario")
+    parser.add_argument('--warmup', type=int, default=30, help="unmeasured frames before timing starts")
+    parser.add_argument('--output', default='bench_results.json', help="where to write the JSON results")
+    parser.add_argument('--compare', help="previous results JSON to compare against")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--entity-memory', action='store_true',
+                        help=f"report bytes per live entity at {'/'.join(map(str, ENTITY_COUNTS))} entities")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    runner = BenchmarkRunner(frames=args.frames, warmup=args.warmup, measure_memory=not args.no_memory)
+    names = args.scenarios or None
+    if args.entity_memory and not args.scenarios:
+        names = []  # Only the per-entity measurement was asked for
+    results = runner.run(names)
+    if args.entity_memory:
+        print("Bytes per live entity...", flush=True)
+        results['entity_memory'] = runner.measure_entity_memory()
+    save_results(results, args.output)
+    print(f"Results written to {os.path.abspath(args.output)}")
+
+    if args.compare:
+        for line in compare_results(load_results(args.compare), results):
+            print(line)
+    pygame.quit()
@@ -1,15 +1,19 @@
 import pygame
-import json
-import os
 import math
 import random
 from src.movement_patterns import create_movement_pattern
 from src.attack_patterns import create_attack_pattern
+from src.tracing import traced, instant
+from src.quality import quality
+from src.config_registry import configs
+from src.events import BOSS_PHASE_CHANGED
+from src.settings import *
 
 class Boss(pygame.sprite.Sprite):
     """Boss enemy with enhanced health, multiple attack phases, and complex patterns"""
+    screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)  # The boss is clamped inside this
     
-    def __init__(self, pos, boss_type, asset_manager, player, groups):
+    def __init__(self, pos, boss_type, asset_manager, player, groups, bullets, hazards=None, events=None):
         super().__init__(groups)
         
         # Load boss configuration
@@ -37,7 +41,8 @@ class Boss(pygame.sprite.Sprite):
                 self.original_image = pygame.Surface((80, 80))
                 self.original_image.fill((255, 0, 0))  # Red boss
         
-        self.image = self.original_image.copy()
+        self.image = self.original_image
+        self.flash_image = asset_manager.get_tinted(self.original_image, 'white')  # Shared, made once
         self.rect = self.image.get_rect(center=pos)
         
         # Position vector for smooth movement
@@ -46,11 +51,10 @@ class Boss(pygame.sprite.Sprite):
         # References
         self.player = player
         self.asset_manager = asset_manager
+        self.events = events  # EventBus for phase changes (WaveManager publishes the defeat)
         
-        # Get sprite groups for attack patterns
+        # Attack patterns emit into the shared enemy bullet system
         all_sprites = groups[0] if groups else None
-        # enemy_bullet_group을 groups 리스트에서 직접 가져옵니다.
-        enemy_bullet_group = groups[2] if len(groups) > 2 else pygame.sprite.Group()
 
         # Boss-specific attributes
         self.phase = 1
@@ -63,7 +67,7 @@ class Boss(pygame.sprite.Sprite):
         self.attack_patterns = []
         for i in range(self.max_phases):
             phase_config = self.config['attack_phases'][i] if i < len(self.config['attack_phases']) else self.config['attack_phases'][-1]
-            pattern = create_attack_pattern(phase_config, all_sprites, enemy_bullet_group, self.asset_manager)
+            pattern = create_attack_pattern(phase_config, all_sprites, bullets, self.asset_manager, hazards)
             self.attack_patterns.append(pattern)
         # Movement pattern
         self.movement = create_movement_pattern(self.config['movement'])
@@ -82,70 +86,8 @@ class Boss(pygame.sprite.Sprite):
         self.health_bar_height = 10
         
     def load_boss_config(self, boss_type):
-        """Load boss configuration from JSON file"""
-        boss_configs = {
-            "angry_migam": {
-                "health": 1000,
-                "asset_key": "migamboss",
-                "phases": 3,
-                "movement": { "type": "boss_hover" },
-                "attack_phases": [
-                    { "type": "spread_shot_image", "image": "jesus", "bullet_count": 5, "spread_angle": 30, "cooldown": 1.5 },
-                    { "type": "fast_forward_shot_image", "image": "tang", "bullet_speed": 600, "cooldown": 0.5 },
-                    { "type": "blue_screen_attack", "num_points": 5, "delay": 1.0, "cooldown": 3.0 }
-                ]
-            },
-            "handsome_gilgil": {
-                "health": 1500,
-                "asset_key": "gilgilboss",
-                "phases": 1,
-                "movement": { "type": "boss_hover", "speed": 30, "amplitude": 120 },
-                "attack_phases": [
-                    { "type": "circular_shot", "bullet_count": 16, "cooldown": 1.0 }
-                ]
-            }
-        }
-        
-        if boss_type in boss_configs:
-            return boss_configs[boss_type]
-
-        config_path = os.path.join('data', 'boss_config.json')
-        try:
-            with open(config_path, 'r') as f:
-                configs = json.load(f)
-                return configs.get(boss_type, configs.get('basic', self.get_default_config()))
-        except (FileNotFoundError, json.JSONDecodeError):
-            return self.get_default_config()
-
-    def get_default_config(self):
-        """Default boss configuration"""
-        return {
-            'health': 500,
-            'asset_key': 'boss',
-            'scale_factor': 2.0,
-            'phases': 3,
-            'movement': {
-                'type': 'boss_hover',
-                'speed': 50
-            },
-            'attack_phases': [
-                {
-                    'type': 'rapid_fire',
-                    'bullet_speed': 200,
-                    'fire_rate': 0.3
-                },
-                {
-                    'type': 'spiral',
-                    'bullet_speed': 150,
-                    'fire_rate': 0.2
-                },
-                {
-                    'type': 'barrage',
-                    'bullet_speed': 250,
-                    'fire_rate': 0.1
-                }
-            ]
-        }
+        """Shared read-only config from the registry (unknown types fall back to 'basic')"""
+        return configs.boss(boss_type)
     
     def update(self, dt):
         """Update boss state"""
@@ -194,29 +136,30 @@ class Boss(pygame.sprite.Sprite):
         self.rect.center = (round(self.pos.x), round(self.pos.y))
         
         # Keep boss on screen
-        screen_rect = pygame.display.get_surface().get_rect()
-        self.rect.clamp_ip(screen_rect)
-        self.pos = pygame.math.Vector2(self.rect.center)
+        self.rect.clamp_ip(self.screen_rect)
+        self.pos.update(self.rect.center)
     
+    @traced()
     def transition_to_phase(self, new_phase):
         """Transition to a new attack phase"""
+        instant('boss_phase', boss=self.boss_type, old_phase=self.phase, new_phase=new_phase)
         self.attack_patterns[self.phase - 1].stop()  # Stop current attack pattern
-        self.phase = new_phase
+        old_phase, self.phase = self.phase, new_phase
         self.invulnerable = True
         self.invulnerable_timer = 1.0  # 1 second invulnerability during transition
         self.flash_timer = 1.0
         print(f"Boss entering phase {new_phase}!")
+        if self.events:
+            self.events.publish(BOSS_PHASE_CHANGED, boss=self, old_phase=old_phase, new_phase=new_phase)
     
     def update_visual_effects(self):
         """Update visual effects like flashing"""
-        self.image = self.original_image.copy()
-        
         # Flash effect during invulnerability or phase transition
-        if self.invulnerable and int(self.age * 10) % 2:
-            # Create flash effect by blending with white
-            flash_surface = pygame.Surface(self.image.get_size())
-            flash_surface.fill((255, 255, 255))
-            self.image.blit(flash_surface, (0, 0), special_flags=pygame.BLEND_ADD)
+        # (skipped while the quality governor has flashes off)
+        if self.invulnerable and quality.flash and int(self.age * 10) % 2:
+            self.image = self.flash_image
+        else:
+            self.image = self.original_image
     
     def take_damage(self, damage=10):
         """Take damage and return True if boss is destroyed"""
@@ -234,9 +177,9 @@ class Boss(pygame.sprite.Sprite):
         return False
     
     def draw_health_bar(self, surface):
-        """Draw boss health bar at top of screen"""
+        """Draw boss health bar at top of screen and return the area it covers"""
         if self.is_entering:
-            return
+            return None
             
         # Calculate position (centered at top of screen)
         screen_width = surface.get_width()
@@ -265,11 +208,11 @@ class Boss(pygame.sprite.Sprite):
         pygame.draw.rect(surface, (255, 255, 255), bg_rect, 2)
         
         # Boss name and phase
-        font = pygame.font.Font(None, 24)
         boss_text = f"{self.boss_type.upper()} - Phase {self.phase}"
-        text_surface = font.render(boss_text, True, (255, 255, 255))
+        text_surface = self.asset_manager.get_text('boss', boss_text, (255, 255, 255))
         text_rect = text_surface.get_rect(centerx=screen_width // 2, y=y + self.health_bar_height + 5)
         surface.blit(text_surface, text_rect)
+        return bg_rect.union(text_rect)
     
     def get_score_value(self):
         """Get the score value for destroying this boss"""
@@ -0,0 +1,273 @@
+import numpy as np
+import pygame
+from itertools import repeat
+from src.settings import *
+
+# Above this many bullet x rect pairs, collision queries go through the grid
+GRID_PAIR_LIMIT = 65536
+
+class BulletSystem:
+    """
+    Structure-of-arrays bullet store.
+
+    Positions, velocities, remaining lifetimes and image ids live in NumPy
+    arrays. update() integrates and culls every bullet in one vectorized
+    step and draw() submits one Surface.blits call for all of them (mixed
+    images are read from their SpriteAtlas page), so bullets cost no
+    Python objects of their own.
+
+    Rects follow pygame's conventions: a bullet's rect has its image size and
+    its center at the rounded position, and overlap tests are strict like
+    Rect.colliderect.
+    """
+
+    def __init__(self, bounds, capacity=256, cell_size=COLLISION_CELL_SIZE, atlas=None):
+        self.bounds = pygame.Rect(bounds)
+        self.count = 0
+        self.high_water = 0  # Most bullets alive at once
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.full(capacity, np.inf)
+        self.image_ids = np.zeros(capacity, dtype=np.int32)
+
+        # Image registry: id -> surface, id -> (w, h)
+        self.images = []
+        self.image_sizes = np.zeros((0, 2), dtype=np.int32)
+        self.image_keys = {}
+        # id -> surface and area the image is blitted from (its atlas page when packed)
+        self.atlas = atlas
+        self.blit_sources = []
+        self.blit_areas = []
+
+        # Uniform grid for collision queries, rebuilt lazily after changes
+        self.cell_size = cell_size
+        self.grid_cols = max(1, -(-self.bounds.width // cell_size))
+        self.grid_rows = max(1, -(-self.bounds.height // cell_size))
+        self.grid = None
+
+    def __len__(self):
+        return self.count
+
+    # --- Images ---
+    def get_image_id(self, key):
+        return self.image_keys.get(key)
+
+    def register_image(self, key, surface):
+        """Register a surface under key and return its image id."""
+        image_id = self.image_keys.get(key)
+        if image_id is None:
+            image_id = len(self.images)
+            self.images.append(surface)
+            source, area = self.atlas.source(surface) if self.atlas else (surface, surface.get_rect())
+            self.blit_sources.append(source)
+            self.blit_areas.append(area)
+            self.image_sizes = np.vstack([self.image_sizes, surface.get_size()]).astype(np.int32)
+            self.image_keys[key] = image_id
+        return image_id
+
+    # --- Emission ---
+    def reserve(self, extra):
+        """Grow the arrays so `extra` more bullets fit."""
+        needed = self.count + extra
+        capacity = len(self.life)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('pos', 'vel', 'life', 'image_ids'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def emit(self, pos, velocity, image_id, lifetime=np.inf):
+        """Add one bullet."""
+        self.reserve(1)
+        i = self.count
+        self.pos[i] = pos
+        self.vel[i] = velocity
+        self.life[i] = lifetime
+        self.image_ids[i] = image_id
+        self.count = i + 1
+        self.high_water = max(self.high_water, self.count)
+        self.grid = None
+
+    def emit_many(self, positions, velocities, image_id, lifetime=np.inf):
+        """Add a batch of bullets; positions may be a single point shared by all."""
+        velocities = np.asarray(velocities, dtype=float).reshape(-1, 2)
+        n = len(velocities)
+        if n == 0:
+            return
+        self.reserve(n)
+        start, end = self.count, self.count + n
+        self.pos[start:end] = positions
+        self.vel[start:end] = velocities
+        self.life[start:end] = lifetime
+        self.image_ids[start:end] = image_id
+        self.count = end
+        self.high_water = max(self.high_water, self.count)
+        self.grid = None
+
+    def stats(self):
+        """Pool-style stats: live bullets, array capacity and high-water mark."""
+        return {'active': self.count, 'free': len(self.life) - self.count, 'high_water': self.high_water}
+
+    def clear(self):
+        self.count = 0
+        self.grid = None
+
+    # --- Simulation ---
+    def rects(self):
+        """Return (left, top, width, height) arrays for the live bullets."""
+        n = self.count
+        sizes = self.image_sizes[self.image_ids[:n]]
+        width, height = sizes[:, 0], sizes[:, 1]
+        centers = np.rint(self.pos[:n]).astype(np.int32)
+        return centers[:, 0] - width // 2, centers[:, 1] - height // 2, width, height
+
+    def overlaps(self, rect):
+        """Boolean mask of live bullets whose rect overlaps `rect`."""
+        left, top, width, height = self.rects()
+        return ((left < rect[0] + rect[2]) & (left + width > rect[0]) &
+                (top < rect[1] + rect[3]) & (top + height > rect[1]))
+
+    def remove(self, mask):
+        """Drop every live bullet where mask is True."""
+        keep = ~mask
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return
+        n = self.count
+        self.pos[:kept] = self.pos[:n][keep]
+        self.vel[:kept] = self.vel[:n][keep]
+        self.life[:kept] = self.life[:n][keep]
+        self.image_ids[:kept] = self.image_ids[:n][keep]
+        self.count = kept
+        self.grid = None
+
+    def update(self, dt):
+        """Integrate positions, age lifetimes and drop expired bullets."""
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= dt
+        self.grid = None
+        self.remove(self.life[:n] <= 0)
+
+    def cull(self, rect):
+        """Drop bullets that no longer overlap rect; returns how many were dropped."""
+        n = self.count
+        if n == 0:
+            return 0
+        self.remove(~self.overlaps(rect))
+        return n - self.count
+
+    # --- Collision ---
+    def build_grid(self):
+        """Sort live bullets by the grid cell of their top-left corner."""
+        left, top, width, height = self.rects()
+        size = self.cell_size
+        cell_x = np.clip((left - self.bounds.left) // size, 0, self.grid_cols - 1)
+        cell_y = np.clip((top - self.bounds.top) // size, 0, self.grid_rows - 1)
+        keys = cell_y * self.grid_cols + cell_x
+        order = np.argsort(keys, kind='stable')
+        # Rect edges in cell order, so every cell is a contiguous run
+        left, top = left[order], top[order]
+        self.grid = (keys[order], order, left, top, left + width[order], top + height[order],
+                     int(width.max()), int(height.max()))
+        return self.grid
+
+    def pairs(self, rects):
+        """
+        Find every (query, bullet) overlap for an (n, 4) array of x, y, w, h
+        rects. Returns two index arrays.
+
+        Small batches are tested all-pairs by broadcasting; past
+        GRID_PAIR_LIMIT candidate pairs the uniform grid narrows them first.
+        """
+        x, y, w, h = rects.T
+        if len(rects) * self.count <= GRID_PAIR_LIMIT:
+            left, top, width, height = self.rects()
+            x, y, w, h = x[:, None], y[:, None], w[:, None], h[:, None]
+            hit = ((left < x + w) & (left + width > x) & (top < y + h) & (top + height > y) &
+                   (w > 0) & (h > 0))  # colliderect never reports empty rects
+            return np.nonzero(hit)
+
+        keys, order, left, top, right, bottom, max_width, max_height = self.grid or self.build_grid()
+        size, cols, rows = self.cell_size, self.grid_cols, self.grid_rows
+        # A bullet can only overlap a rect if its top-left lies within
+        # max bullet size above/left of it
+        x0 = np.clip((x - max_width - self.bounds.left) // size, 0, cols - 1)
+        x1 = np.clip((x + w - 1 - self.bounds.left) // size, 0, cols - 1)
+        y0 = np.clip((y - max_height - self.bounds.top) // size, 0, rows - 1)
+        y1 = np.clip((y + h - 1 - self.bounds.top) // size, 0, rows - 1)
+
+        # One (query, grid row) entry per row each rect spans
+        row_counts = y1 - y0 + 1
+        query = np.repeat(np.arange(len(rects)), row_counts)
+        row = y0[query] + np.arange(len(query)) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+        start = np.searchsorted(keys, row * cols + x0[query], 'left')
+        end = np.searchsorted(keys, row * cols + x1[query], 'right')
+
+        # Expand each row's run of bullets into candidate pairs, then test exactly
+        counts = end - start
+        query = np.repeat(query, counts)
+        slot = np.arange(len(query)) + np.repeat(start - (np.cumsum(counts) - counts), counts)
+        hit = ((left[slot] < x[query] + w[query]) & (right[slot] > x[query]) &
+               (top[slot] < y[query] + h[query]) & (bottom[slot] > y[query]) &
+               (w[query] > 0) & (h[query] > 0))  # colliderect never reports empty rects
+        return query[hit], order[slot[hit]]
+
+    def collide_rect(self, rect, remove=True):
+        """Count bullets overlapping rect, removing them if requested."""
+        if self.count == 0:
+            return 0
+        _, hit = self.pairs(np.array([tuple(rect)]))
+        if len(hit) and remove:
+            mask = np.zeros(self.count, dtype=bool)
+            mask[hit] = True
+            self.remove(mask)
+        return len(np.unique(hit))
+
+    def collide_sprites(self, sprites, remove=True):
+        """
+        Match bullets against sprites, like groupcollide with dokill on the
+        bullet side. Returns {sprite: number of bullets that hit it}.
+        """
+        sprites = list(sprites)
+        if self.count == 0 or not sprites:
+            return {}
+        query, hit = self.pairs(np.array([tuple(sprite.rect) for sprite in sprites]))
+        if len(hit) == 0:
+            return {}
+        counts = np.bincount(query, minlength=len(sprites))
+        hits = {sprites[i]: int(counts[i]) for i in np.flatnonzero(counts).tolist()}
+        if remove:
+            mask = np.zeros(self.count, dtype=bool)
+            mask[hit] = True
+            self.remove(mask)
+        return hits
+
+    # --- Rendering ---
+    def draw(self, surface, dirty=None):
+        """
+        Blit every live bullet in one Surface.blits call. If a dirty list is
+        given, the bullet rects are appended to it as tuples.
+        """
+        n = self.count
+        if n == 0:
+            return
+        left, top, width, height = self.rects()
+        if dirty is not None:
+            dirty.extend(zip(left.tolist(), top.tolist(), width.tolist(), height.tolist()))
+        coords = zip(left.tolist(), top.tolist())
+        ids = self.image_ids[:n]
+        first = ids[0]
+        if (ids == first).all():
+            # One image: blit it directly, which skips parsing an area per bullet
+            surface.blits(zip(repeat(self.images[first]), coords), doreturn=False)
+            return
+        ids = ids.tolist()
+        sources, areas = map(self.blit_sources.__getitem__, ids), map(self.blit_areas.__getitem__, ids)
+        surface.blits(zip(sources, coords, areas), doreturn=False)
@@ -0,0 +1,272 @@
+import json
+import os
+from types import MappingProxyType
+from src.settings import *
+from src.movement_patterns import MOVEMENT_PATTERNS
+from src.attack_patterns import ATTACK_PATTERNS
+
+CONFIG_DIR = 'data'
+
+# Fallback used when enemy_config.json is missing or an unknown type has no scout entry
+DEFAULT_ENEMY_CONFIG = {
+    'health': 20,
+    'asset_key': 'enemy',
+    'movement': {
+        'type': 'straight',
+        'speed': 100
+    },
+    'attack': {
+        'type': 'none'
+    }
+}
+FALLBACK_ENEMY_TYPE = 'scout'
+
+DEFAULT_BOSS_CONFIG = {
+    'health': 500,
+    'asset_key': 'boss',
+    'scale_factor': 2.0,
+    'phases': 3,
+    'movement': {
+        'type': 'boss_hover',
+        'speed': 50
+    },
+    'attack_phases': [
+        {
+            'type': 'rapid_fire',
+            'bullet_speed': 200,
+            'fire_rate': 0.3
+        },
+        {
+            'type': 'spiral',
+            'bullet_speed': 150,
+            'fire_rate': 0.2
+        },
+        {
+            'type': 'barrage',
+            'bullet_speed': 250,
+            'fire_rate': 0.1
+        }
+    ]
+}
+FALLBACK_BOSS_TYPE = 'basic'
+
+# Bosses defined in code; these take precedence over boss_config.json
+BUILTIN_BOSS_CONFIGS = {
+    "angry_migam": {
+        "health": 1000,
+        "asset_key": "migamboss",
+        "phases": 3,
+        "movement": { "type": "boss_hover" },
+        "attack_phases": [
+            { "type": "spread_shot_image", "image": "jesus", "bullet_count": 5, "spread_angle": 30, "cooldown": 1.5 },
+            { "type": "fast_forward_shot_image", "image": "tang", "bullet_speed": 600, "cooldown": 0.5 },
+            { "type": "blue_screen_attack", "num_points": 5, "delay": 1.0, "cooldown": 3.0 }
+        ]
+    },
+    "handsome_gilgil": {
+        "health": 1500,
+        "asset_key": "gilgilboss",
+        "phases": 1,
+        "movement": { "type": "boss_hover", "speed": 30, "amplitude": 120 },
+        "attack_phases": [
+            { "type": "circular_shot", "bullet_count": 16, "cooldown": 1.0 }
+        ]
+    }
+}
+
+# Default wave configurations if wave_config.json doesn't exist
+DEFAULT_WAVE_CONFIGS = {
+    "1": {
+        "name": "Scout Wave",
+        "enemies": {
+            "scout": 8
+        },
+        "spawn_delay": 1200,
+        "spawn_pattern": "random"
+    },
+    "2": {
+        "name": "Fighter Squadron",
+        "enemies": {
+            "fighter": 6,
+            "scout": 6
+        },
+        "spawn_delay": 1000,
+        "spawn_pattern": "random"
+    },
+    "3": {
+        "name": "Heavy Assault",
+        "enemies": {
+            "gunship": 4,
+            "fighter": 8,
+            "interceptor": 3
+        },
+        "spawn_delay": 800,
+        "spawn_pattern": "formation"
+    },
+    "4": {
+        "name": "Bomber Wing",
+        "enemies": {
+            "bomber": 3,
+            "interceptor": 6,
+            "gunship": 4,
+            "fighter": 6
+        },
+        "spawn_delay": 700,
+        "spawn_pattern": "waves"
+    },
+    "5": {
+        "name": "Elite Forces",
+        "enemies": {
+            "bomber": 4,
+            "interceptor": 8,
+            "gunship": 6,
+            "fighter": 10,
+            "scout": 5
+        },
+        "spawn_delay": 600,
+        "spawn_pattern": "mixed"
+    }
+}
+
+# Enemy mix of procedural waves (count per unit of difficulty)
+PROCEDURAL_WAVE_ENEMIES = {
+    "scout": 5,
+    "basic": 3,
+    "fighter": 4,
+    "gunship": 2,
+    "interceptor": 2,
+    "bomber": 1
+}
+
+SPAWN_PATTERNS = ('random', 'formation', 'waves', 'mixed')
+
+
+def freeze(value):
+    """Read-only deep copy: dicts become mapping proxies, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ConfigRegistry:
+    """
+    Enemy, boss and wave configs, loaded and validated once.
+
+    Configs are normalized (missing keys filled from the defaults) and
+    frozen, so every spawn shares the same read-only objects. Problems
+    such as unknown enemy types or attack types without an implementation
+    are collected in `problems` and printed when the registry loads.
+    """
+
+    def __init__(self, config_dir=CONFIG_DIR):
+        self.config_dir = config_dir
+        self.loaded = False
+        self.enemies = {}
+        self.bosses = {}
+        self.waves = {}
+        self.problems = []
+
+    def load(self):
+        """Read, normalize and validate every config file."""
+        self.problems = []
+        self.enemies = {key: self.normalize_enemy(key, config)
+                        for key, config in self.read('enemy_config.json', {}).items()}
+        if not self.enemies:
+            self.enemies[FALLBACK_ENEMY_TYPE] = self.normalize_enemy(FALLBACK_ENEMY_TYPE, DEFAULT_ENEMY_CONFIG)
+        self.fallback_enemy = self.enemies.get(FALLBACK_ENEMY_TYPE, freeze(DEFAULT_ENEMY_CONFIG))
+
+        boss_configs = dict(self.read('boss_config.json', {}))
+        boss_configs.update(BUILTIN_BOSS_CONFIGS)
+        self.bosses = {key: self.normalize_boss(key, config) for key, config in boss_configs.items()}
+        self.fallback_boss = self.bosses.get(FALLBACK_BOSS_TYPE) or self.normalize_boss('default', DEFAULT_BOSS_CONFIG)
+
+        self.waves = {key: self.normalize_wave(key, config)
+                      for key, config in self.read('wave_config.json', DEFAULT_WAVE_CONFIGS).items()}
+
+        # Enemy types spawned from outside the wave files
+        for enemy_type in PROCEDURAL_WAVE_ENEMIES:
+            self.check_enemy_type(enemy_type, "procedural waves")
+        for packet_type, enemy_type in PACKET_TO_ENEMY_MAP.items():
+            self.check_enemy_type(enemy_type, f"network '{packet_type}' packets")
+
+        self.loaded = True
+        for problem in self.problems:
+            print(f"Config: {problem}")
+        return self
+
+    def read(self, filename, default):
+        path = os.path.join(self.config_dir, filename)
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+        except json.JSONDecodeError as e:
+            self.problems.append(f"{path} is not valid JSON ({e}); using defaults")
+            return default
+
+    # --- Normalization ---
+    def normalize_enemy(self, enemy_type, config):
+        config = {**DEFAULT_ENEMY_CONFIG, **config}
+        where = f"enemy '{enemy_type}'"
+        self.check_pattern(config['movement'], MOVEMENT_PATTERNS, 'movement', where)
+        self.check_pattern(config['attack'], ATTACK_PATTERNS, 'attack', where)
+        return freeze(config)
+
+    def normalize_boss(self, boss_type, config):
+        config = {**DEFAULT_BOSS_CONFIG, **config}
+        where = f"boss '{boss_type}'"
+        if not config['attack_phases']:
+            config['attack_phases'] = DEFAULT_BOSS_CONFIG['attack_phases']
+            self.problems.append(f"{where}: no attack phases, using defaults")
+        self.check_pattern(config['movement'], MOVEMENT_PATTERNS, 'movement', where)
+        for number, phase in enumerate(config['attack_phases'], 1):
+            self.check_pattern(phase, ATTACK_PATTERNS, 'attack', f"{where} phase {number}")
+        return freeze(config)
+
+    def normalize_wave(self, wave_key, config):
+        where = f"wave {wave_key}"
+        config = {'name': f"Wave {wave_key}", 'enemies': {}, 'spawn_delay': 1000, 'spawn_pattern': 'random', **config}
+        for enemy_type in config['enemies']:
+            self.check_enemy_type(enemy_type, where)
+        if config['spawn_pattern'] not in SPAWN_PATTERNS:
+            self.problems.append(f"{where}: unknown spawn pattern '{config['spawn_pattern']}' (spawns at random)")
+        return freeze(config)
+
+    def check_pattern(self, config, patterns, kind, where):
+        pattern_type = config.get('type')
+        if pattern_type not in patterns:
+            fallback = 'straight movement' if kind == 'movement' else 'no attack'
+            self.problems.append(f"{where}: {kind} type '{pattern_type}' is not implemented ({fallback})")
+
+    def check_enemy_type(self, enemy_type, where):
+        if enemy_type not in self.enemies:
+            self.problems.append(f"{where}: unknown enemy type '{enemy_type}' (spawns as {FALLBACK_ENEMY_TYPE})")
+
+    # --- Lookups ---
+    def enemy_types(self):
+        if not self.loaded:
+            self.load()
+        return list(self.enemies)
+
+    def enemy(self, enemy_type):
+        if not self.loaded:
+            self.load()
+        return self.enemies.get(enemy_type, self.fallback_enemy)
+
+    def boss(self, boss_type):
+        if not self.loaded:
+            self.load()
+        return self.bosses.get(boss_type, self.fallback_boss)
+
+    def wave(self, wave_number):
+        """Config of a numbered wave, or None when the wave is procedural"""
+        if not self.loaded:
+            self.load()
+        return self.waves.get(str(wave_number))
+
+
+# Shared registry; Game loads it at startup, lookups load it on first use otherwise
+configs = ConfigRegistry()
@@ -0,0 +1,37 @@
+import pygame
+from src.settings import *
+
+class CullingPass:
+    """
+    Removes entities that have left the play area, once per frame.
+
+    Each entity kind has its own margin around the world bounds; the
+    inflated bounds are computed once here instead of in every update().
+    Sprite groups are tested with Rect.colliderect and bullet systems in
+    one vectorized overlap test. Counts are kept for the last frame and
+    since the state started.
+    """
+
+    def __init__(self, bounds, margins=CULL_MARGINS):
+        self.world = pygame.Rect(bounds)
+        self.bounds = {kind: self.world.inflate(2 * margin, 2 * margin) for kind, margin in margins.items()}
+        self.last = dict.fromkeys(margins, 0)
+        self.totals = dict.fromkeys(margins, 0)
+
+    def cull_sprites(self, kind, sprites, exclude=None):
+        """Kill every sprite (but exclude) whose rect no longer overlaps the bounds for kind."""
+        inside = self.bounds[kind].colliderect
+        culled = [sprite for sprite in sprites if not inside(sprite.rect) and sprite is not exclude]
+        for sprite in culled:
+            sprite.kill()
+        self.count(kind, len(culled))
+
+    def cull_bullets(self, kind, bullets):
+        self.count(kind, bullets.cull(self.bounds[kind]))
+
+    def count(self, kind, culled):
+        self.last[kind] = culled
+        self.totals[kind] += culled
+
+    def stats(self):
+        return {kind: {'last': self.last[kind], 'total': self.totals[kind]} for kind in self.totals}
@@ -0,0 +1,84 @@
+import pygame
+from src.settings import *
+
+class DirtyRectRenderer:
+    """
+    Dirty-rectangle presentation for states drawn on a plain background.
+
+    A state that supports it calls begin() instead of filling the screen,
+    which erases only what was drawn last frame, and reports every area it
+    draws with add(). present() then hands last frame's and this frame's
+    rects to pygame.display.update(). Whenever that would not pay off -
+    the dirty area or rect count is over its limit, the previous frame is
+    unknown, or the renderer is off - it fills and flips the whole screen
+    as before.
+    """
+
+    def __init__(self, screen_rect, background=BLACK, enabled=DIRTY_RECTS_ENABLED,
+                 area_limit=DIRTY_RECT_AREA_LIMIT, count_limit=DIRTY_RECT_COUNT_LIMIT):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.background = background
+        self.enabled = enabled
+        self.area_limit = area_limit * self.screen_rect.width * self.screen_rect.height
+        self.count_limit = count_limit
+
+        self.previous = []  # Rects drawn last frame
+        self.current = []  # Rects drawn this frame
+        self.known = False  # Whether the screen holds exactly `previous` on the background
+        self.drawing = False  # A state drew through begin() this frame
+
+        # Last present(), for the profiler overlay
+        self.last_mode = 'flip'
+        self.last_rects = 0
+        self.last_area = 0.0
+
+    def toggle(self):
+        """Turn dirty-rect presentation on or off (F6)."""
+        self.enabled = not self.enabled
+        self.known = False
+        print(f"Dirty-rect rendering {'on' if self.enabled else 'off'}")
+
+    def invalidate(self):
+        """Forget what is on screen; the next frame is filled and flipped."""
+        self.known = False
+
+    def begin(self, screen):
+        """Erase last frame's drawing, or the whole screen when that is cheaper or required."""
+        self.drawing = True
+        self.current = []
+        if not self.enabled or not self.known or len(self.previous) > self.count_limit:
+            screen.fill(self.background)
+            return
+        fill, background = screen.fill, self.background
+        for rect in self.previous:
+            fill(background, rect)
+
+    def add(self, rect):
+        if rect is not None:
+            self.current.append(rect)
+
+    def add_many(self, rects):
+        self.current.extend(rects)
+
+    def present(self):
+        """Show the frame: update only the dirty rects, or flip the whole window."""
+        dirty = self.previous + self.current
+        area = 0
+        for rect in dirty:
+            area += rect[2] * rect[3]
+
+        if (self.enabled and self.drawing and self.known and
+                len(dirty) <= self.count_limit and area <= self.area_limit):
+            pygame.display.update(dirty)
+            self.last_mode = 'rects'
+        else:
+            pygame.display.flip()
+            self.last_mode = 'flip'
+        self.last_rects = len(dirty)
+        self.last_area = area / (self.screen_rect.width * self.screen_rect.height)
+
+        # Only frames drawn through begin()/add() leave a screen we can patch next time
+        self.known = self.drawing
+        self.previous = self.current if self.drawing else []
+        self.current = []
+        self.drawing = False
@@ -1,103 +1,103 @@
 import pygame
-import json
-import os
-from src.movement_patterns import create_movement_pattern
-from src.attack_patterns import create_attack_pattern
+from src.pools import PooledSprite
+from src.quality import quality
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, pos, enemy_type, asset_manager, player, groups):
+class Enemy(PooledSprite):
+    # Per-type data (config, asset key, score...) is read through the archetype
+    __slots__ = ('player', 'all_sprites', 'bullets', 'hazards', 'archetype',
+                 'health', 'max_health', 'original_image', 'image', 'rect', 'pos',
+                 'movement', 'attack', 'age', 'batched', 'flash_timer')
+    flash_duration = 0.1  # Blink for 0.1 seconds
+
+    def __init__(self, pos, archetype, player, groups, bullets, hazards=None):
         super().__init__(groups)
         
-        # Load enemy configuration
-        self.config = self.load_enemy_config(enemy_type)
+        # References to other game objects
+        self.player = player
         
-        # Core attributes from config
-        self.health = self.config['health']
-        self.max_health = self.health
-        self.enemy_type = enemy_type
-        
-        # Load sprite
-        asset_key = self.config.get('asset_key', 'enemy')
-        self.original_image = asset_manager.get_image(asset_key)
-        if not self.original_image:
-            # Fallback to basic enemy sprite
-            self.original_image = asset_manager.get_image('enemy')
-        self.image = self.original_image.copy()
-        self.rect = self.image.get_rect(center=pos)
+        # Attack patterns emit into the shared enemy bullet system
+        self.all_sprites = groups[0] if groups else None
+        self.bullets = bullets
+        self.hazards = hazards
         
-        # Position vector for smooth movement
-        self.pos = pygame.math.Vector2(self.rect.center)
+        self.archetype = None
+        # Allocated once; reset() updates them in place when the pool reuses this enemy
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.pos = pygame.math.Vector2()
+        self.reset(pos, archetype)
         
-        # References to other game objects
-        self.player = player
-        self.asset_manager = asset_manager
+    def reset(self, pos, archetype):
+        """(Re)initialize from a compiled archetype; patterns are reused when the type is unchanged"""
+        same_type = archetype is self.archetype
+        self.archetype = archetype
+        
+        # Core attributes from config
+        self.health = self.max_health = archetype.health
         
-        # Get sprite groups for attack patterns
-        all_sprites = groups[0] if groups else None
-        # enemy_bullet_group을 groups 리스트에서 직접 가져옵니다.
-        enemy_bullet_group = groups[2] if len(groups) > 2 else pygame.sprite.Group()
+        # Shared sprite image
+        self.original_image = self.image = archetype.image
+        self.rect.size = archetype.hitbox
+        self.rect.center = pos
+        
+        # Position vector for smooth movement
+        self.pos.update(self.rect.center)
         
         # Behavior components
-        self.movement = create_movement_pattern(self.config['movement'])
-        self.attack = create_attack_pattern(self.config['attack'], all_sprites, enemy_bullet_group, self.asset_manager)
+        if same_type:
+            self.movement.reset()
+            self.attack.reset()
+        else:
+            self.movement = archetype.create_movement()
+            self.attack = archetype.create_attack(self.all_sprites, self.bullets, self.hazards)
         # Internal state
         self.age = 0.0
+        self.batched = False  # Set when MovementBatch already moved this enemy this frame
         
         # Visual effects for blinking
         self.flash_timer = 0.0
-        self.flash_duration = 0.1  # Blink for 0.1 seconds
-        
-    def load_enemy_config(self, enemy_type):
-        """Load enemy configuration from JSON file"""
-        config_path = os.path.join('data', 'enemy_config.json')
-        try:
-            with open(config_path, 'r') as f:
-                configs = json.load(f)
-                return configs.get(enemy_type, configs.get('scout', self.get_default_config()))
-        except (FileNotFoundError, json.JSONDecodeError):
-            return self.get_default_config()
-            
-    def get_default_config(self):
-        """Default enemy configuration"""
-        return {
-            'health': 20,
-            'asset_key': 'enemy',
-            'movement': {
-                'type': 'straight',
-                'speed': 100
-            },
-            'attack': {
-                'type': 'none'
-            }
-        }
+        
+    @property
+    def enemy_type(self): return self.archetype.enemy_type
+
+    @property
+    def config(self): return self.archetype.config
+
+    @property
+    def asset_manager(self): return self.archetype.asset_manager
+
+    @property
+    def asset_key(self): return self.archetype.asset_key
+
+    @property
+    def face_movement(self): return self.archetype.face_movement
         
     def update(self, dt):
         """Update enemy state"""
         self.age += dt
         
         # Update behavior
-        self.movement.update(dt, self)
+        if self.batched:
+            self.batched = False
+        else:
+            old_x, old_y = self.pos.x, self.pos.y
+            self.movement.update(dt, self)
+            if self.face_movement and (self.pos.x != old_x or self.pos.y != old_y):
+                self.original_image = self.asset_manager.get_facing(self.asset_key, (self.pos.x - old_x, self.pos.y - old_y))
+                self.rect.size = self.original_image.get_size()
         if self.player:
             self.attack.update(dt, self, self.player)
         
         # Update rect from position
         self.rect.center = (round(self.pos.x), round(self.pos.y))
         
-        # Update flash effect
+        # Update flash effect (cached white silhouette, shared by the type)
+        # (skipped while the quality governor has flashes off)
         if self.flash_timer > 0:
             self.flash_timer -= dt
-            # Create a white version of the image for flashing
-            white_image = self.original_image.copy()
-            white_image.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_ADD)
-            self.image = white_image
+            self.image = self.asset_manager.get_tinted(self.original_image, 'white') if quality.flash else self.original_image
         else:
             self.image = self.original_image
-
-        # Despawn when off screen
-        screen_rect = pygame.display.get_surface().get_rect()
-        expanded_rect = screen_rect.inflate(100, 100)
-        if not self.rect.colliderect(expanded_rect):
-            self.kill()
+        # Off-screen despawn happens in GameplayState's culling pass
             
     def take_damage(self, damage=5):
         """Take damage and return True if enemy is destroyed"""
@@ -111,12 +111,4 @@ class Enemy(pygame.sprite.Sprite):
         
     def get_score_value(self):
         """Get the score value for destroying this enemy"""
-        score_values = {
-            'scout': 50,
-            'fighter': 100,
-            'gunship': 150,
-            'interceptor': 120,
-            'bomber': 200,
-            'basic': 75
-        }
-        return score_values.get(self.enemy_type, 50)
\ No newline at end of file
+        return self.archetype.score_value
@@ -0,0 +1,41 @@
+from collections import Counter
+
+# Gameplay events and the keyword arguments they are published with
+WAVE_STARTED = 'wave_started'  # wave_number, max_waves, name, is_boss_wave
+BOSS_SPAWNED = 'boss_spawned'  # boss
+BOSS_PHASE_CHANGED = 'boss_phase_changed'  # boss, old_phase, new_phase
+BOSS_DEFEATED = 'boss_defeated'  # boss
+PLAYER_HIT = 'player_hit'  # player, damage
+POWERUP_EXPIRED = 'powerup_expired'  # player, powerup_type
+EVENT_TYPES = (WAVE_STARTED, BOSS_SPAWNED, BOSS_PHASE_CHANGED, BOSS_DEFEATED, PLAYER_HIT, POWERUP_EXPIRED)
+
+class EventBus:
+    """
+    Synchronous publish/subscribe between gameplay and its observers.
+
+    publish() calls every handler of the event type right away, in
+    subscription order, with the event's keyword arguments. Nothing is
+    queued, so a handler sees the game exactly as the publisher left it.
+    """
+
+    def __init__(self):
+        self.handlers = {}  # Event type -> list of handlers
+        self.counts = Counter()  # Events published per type
+
+    def subscribe(self, event_type, handler):
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        handlers = self.handlers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def unsubscribe_all(self, owner):
+        """Drop every handler bound to owner, e.g. a GameplayState being replaced."""
+        for event_type, handlers in self.handlers.items():
+            self.handlers[event_type] = [handler for handler in handlers if getattr(handler, '__self__', None) is not owner]
+
+    def publish(self, event_type, **data):
+        self.counts[event_type] += 1
+        for handler in self.handlers.get(event_type, ()):
+            handler(**data)
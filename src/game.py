@@ -1,14 +1,28 @@
 import pygame
+import os
 import sys
+import time
 from src.settings import *
 from src.asset_manager import AssetManager
+from src.config_registry import configs
 from src.states import StateManager
 from src.network_monitor import NetworkMonitor  # NetworkMonitor 임포트
+from src.profiler import FrameProfiler
+from src.tracing import tracer, TRACE_ENV_VAR
+from src.metrics import FrameMetrics, EventMetrics, MetricsExporter, MetricsServer
+from src.dirty_rects import DirtyRectRenderer
+from src.quality import quality
+from src.game_clock import game_clock
+from src.replay import REPLAY_ENV_VAR
+from src.events import EventBus, BOSS_SPAWNED, BOSS_DEFEATED
 
 class Game:
     def __init__(self):
         # Initialize pygame
         """Initialize the game, display, and assets."""
+        self.startup_start = time.perf_counter()
+        self.startup_reported = False
+        self.loading_frames = []  # Main-thread work time of each frame drawn while assets load
         try:
             # 사운드 끊김 방지를 위해 pygame.init()보다 먼저 호출합니다.
             pygame.mixer.pre_init(44100, -16, 2, 512)
@@ -30,11 +44,32 @@ class Game:
         self.clock = pygame.time.Clock()
         self.running = True
         
-        # Asset manager
+        # Dirty-rect presentation (F6 to toggle, or set STRIKER_DIRTY_RECTS=1)
+        self.renderer = DirtyRectRenderer(self.screen.get_rect(),
+                                          enabled=DIRTY_RECTS_ENABLED or os.environ.get('STRIKER_DIRTY_RECTS') == '1')
+        
+        # Frame profiler overlay (F3 to toggle, F4 to record CSV)
+        self.profiler = FrameProfiler()
+        
+        # Span tracing (F5 to start/stop, or set STRIKER_TRACE=<file> to trace from startup)
+        self.trace_path = os.environ.get(TRACE_ENV_VAR)
+        if self.trace_path:
+            tracer.start()
+        
+        # Replay recording (STRIKER_RECORD=<dir>: every gameplay session is written there)
+        self.replay_dir = os.environ.get(REPLAY_ENV_VAR)
+        
+        # Asset manager: fonts and portraits first, gameplay sprites and sounds
+        # keep loading in the background while the scenario screen is up
         self.asset_manager = AssetManager()
-        self.asset_manager.load_all()
+        self.asset_manager.start_loading()
+        configs.load()  # 적/보스/웨이브 설정은 시작 시 한 번만 읽고 검증
+        # 배경음악은 로딩이 끝난 뒤 run()에서 재생합니다 (mixer.music.play가 SFX 디코딩과 겹치면 메인 스레드가 멈춤)
         
-        self.play_bgm() # 배경음악 재생
+        # Gameplay events (wave/boss/player); the game switches the BGM on boss events
+        self.events = EventBus()
+        self.events.subscribe(BOSS_SPAWNED, self.on_boss_spawned)
+        self.events.subscribe(BOSS_DEFEATED, self.on_boss_defeated)
         
         # State manager
         self.state_manager = StateManager(self)
@@ -43,6 +78,13 @@ class Game:
         self.network_monitor = NetworkMonitor()
         self.network_monitor.start()
         
+        # --- 메트릭 엔드포인트 (선택 사항) ---
+        self.metrics = None
+        self.metrics_server = None
+        metrics_port = os.environ.get('STRIKER_METRICS_PORT')
+        if METRICS_ENABLED or metrics_port:
+            self.start_metrics(int(metrics_port) if metrics_port else METRICS_PORT)
+        
 # src/game.py
 
     def play_bgm(self):
@@ -59,35 +101,135 @@ class Game:
            except pygame.error as e:
                print(f"Error playing background music: {e}")
 
+    def on_boss_spawned(self, boss):
+        if pygame.mixer.get_init():  # 믹서가 초기화되었는지 확인
+            pygame.mixer.music.stop() # 보스가 나타나면 기존 BGM 정지
+            
+    def on_boss_defeated(self, boss):
+        self.play_bgm() # 보스가 사라지면 BGM 다시 재생
+
+    def start_metrics(self, port):
+        """Start the localhost Prometheus endpoint."""
+        self.metrics = FrameMetrics()
+        event_metrics = EventMetrics(self.events)
+        try:
+            self.metrics_server = MetricsServer(MetricsExporter(self, self.metrics, event_metrics), METRICS_HOST, port)
+            self.metrics_server.start()
+        except OSError as e:
+            print(f"Warning: Could not start metrics endpoint on port {port}: {e}")
+            self.metrics = None
+
+    def finish_startup(self, first_frame):
+        """Start the BGM once every asset group is in, then print the startup report."""
+        self.startup_reported = True
+        bgm_start = time.perf_counter()
+        self.play_bgm() # 배경음악 재생
+        bgm_time = time.perf_counter() - bgm_start
+        
+        print(f"Startup: first frame at {(first_frame - self.startup_start) * 1000:.1f} ms")
+        for line in self.asset_manager.startup_report(self.startup_start):
+            print(line)
+        # Main-thread stalls that no wait_for saw (slow frames while loading, the BGM start)
+        frames = self.loading_frames
+        budget = 1.0 / FPS
+        print(f"  main thread while loading: {len(frames)} frames, longest {max(frames, default=0.0) * 1000:.1f} ms,"
+              f" {sum(work > budget for work in frames)} over {budget * 1000:.1f} ms; BGM start took {bgm_time * 1000:.1f} ms")
+        self.loading_frames = []
+
+    def toggle_trace(self):
+        """Start span tracing, or stop it and write the trace file."""
+        if tracer.enabled:
+            tracer.stop()
+            tracer.export(self.trace_path)
+        else:
+            tracer.start()
+            print("Tracing started (F5 to stop and export)")
+
     def run(self):
         """Main game loop"""
         last_time = pygame.time.get_ticks()
+        profiler = self.profiler
+        first_frame = None
         
         while self.running:
             # Calculate delta time
             current_time = pygame.time.get_ticks()
+            frame_start = time.perf_counter()
             dt = (current_time - last_time) / 1000.0  # Convert to seconds
             last_time = current_time
+            profiler.begin_frame()
+            if self.metrics:
+                self.metrics.record_frame(dt)
             
             # Handle events
             events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    
-            # Update current state
-            self.state_manager.current_state.handle_events(events)
-            self.state_manager.current_state.update(dt)
+            profiler.begin('handle_events')
+            with tracer.span('handle_events'):
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_F3:
+                            profiler.toggle()
+                        elif event.key == pygame.K_F4:
+                            profiler.toggle_csv()
+                        elif event.key == pygame.K_F5:
+                            self.toggle_trace()
+                        elif event.key == pygame.K_F6:
+                            self.renderer.toggle()
+                        elif event.key == pygame.K_F7:
+                            quality.toggle()
+                        
+                self.state_manager.current_state.handle_events(events)
+            profiler.end('handle_events')
+            # handle_events may have switched states
+            state = self.state_manager.current_state
+            
+            # Update current state (cooldowns and wave timers read game_clock)
+            game_clock.advance(dt)
+            with tracer.span('update'):
+                state.update(dt)
+            if tracer.enabled:
+                tracer.counter('entities', **state.entity_counts())
             
             # Draw current state
-            self.state_manager.current_state.draw(self.screen)
+            with tracer.span('draw'):
+                state.draw(self.screen)
+                self.renderer.add(profiler.draw(self.screen))
+            
+            # Update display (only the dirty rects when the state supports it)
+            profiler.begin('flip')
+            with tracer.span('flip'):
+                self.renderer.present()
+            profiler.end('flip')
+            profiler.end_frame(state, self.renderer)
+            # 프레임 작업 시간(대기 제외)으로 품질 단계를 조절합니다
+            work_time = time.perf_counter() - frame_start
+            quality.record_frame(work_time)
+            if not self.startup_reported:
+                if first_frame is None:
+                    first_frame = time.perf_counter()
+                self.loading_frames.append(work_time)
+                if self.asset_manager.loading_done():
+                    self.finish_startup(first_frame)
+            with tracer.span('tick'):
+                # 입력이 있을 때만 바뀌는 화면(시나리오, 캐릭터 선택, 메뉴)에서는 낮은 프레임으로 쉽니다
+                self.clock.tick(IDLE_FPS if state.idle else FPS)
             
-            # Update display
-            pygame.display.flip()
-            self.clock.tick(FPS)
+        # 녹화 중인 리플레이와 프로파일 데이터 저장
+        gameplay = self.state_manager.states.get('gameplay')
+        if gameplay:
+            gameplay.end_recording()
+        if profiler.csv_rows is not None:
+            profiler.stop_csv()
+        if tracer.enabled:
+            tracer.stop()
+            tracer.export(self.trace_path)
             
         # --- 네트워크 모니터 종료 ---
         self.network_monitor.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
         
         # Quit
         pygame.quit()
@@ -0,0 +1,27 @@
+class GameClock:
+    """
+    Game time in milliseconds: the time base for cooldowns, wave timers and
+    effect durations.
+
+    It only moves when the frame loop calls advance() with the frame's dt,
+    so headless runs can step game time faster than the wall clock and get
+    the same timers a real session at that frame rate would.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.time = 0.0  # Seconds
+        self.ticks = 0  # Milliseconds, like pygame.time.get_ticks()
+
+    def advance(self, dt):
+        self.time += dt
+        self.ticks = int(self.time * 1000)
+
+    def get_ticks(self):
+        return self.ticks
+
+
+# Shared game clock; Game.run and the headless runners advance it once per frame
+game_clock = GameClock()
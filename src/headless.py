@@ -0,0 +1,45 @@
+import os
+import pygame
+from src.settings import *
+from src.asset_manager import AssetManager
+from src.config_registry import configs
+from src.states import StateManager
+from src.profiler import FrameProfiler
+from src.dirty_rects import DirtyRectRenderer
+from src.events import EventBus
+
+class HeadlessGame:
+    """
+    Minimal stand-in for Game that drives states without a real window or audio.
+
+    Used by the benchmark tools, which step GameplayState frame by frame
+    instead of going through Game.run.
+    """
+
+    def __init__(self):
+        # 더미 드라이버로 창/사운드 없이 실행
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.init()
+
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.clock = pygame.time.Clock()
+        self.running = True
+        self.profiler = FrameProfiler()
+        self.renderer = DirtyRectRenderer(self.screen.get_rect())
+        self.events = EventBus()  # No audio subscribers; no music to switch
+
+        self.asset_manager = AssetManager()
+        self.asset_manager.load_all()
+        configs.load()
+
+        self.state_manager = StateManager(self)
+
+    def play_bgm(self):
+        """No background music in headless runs."""
+        pass
+
+    def new_gameplay(self):
+        """Start a fresh GameplayState and return it."""
+        self.state_manager.change_state('gameplay')
+        return self.state_manager.current_state
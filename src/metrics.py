@@ -0,0 +1,174 @@
+import threading
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from src.settings import *
+from src.quality import quality
+from src.events import EVENT_TYPES, WAVE_STARTED, BOSS_SPAWNED, BOSS_PHASE_CHANGED, BOSS_DEFEATED
+
+# Frame time histogram buckets (seconds); 0.0167 is one frame at 60 FPS
+FRAME_BUCKETS = (0.008, 0.0167, 0.025, 0.0333, 0.05, 0.1, 0.25, 1.0)
+QUANTILES = (0.5, 0.9, 0.99)
+
+class FrameMetrics:
+    """
+    Pre-aggregated per-frame counters.
+
+    record_frame is the only call made from the game loop; everything else
+    is derived when the endpoint is scraped.
+    """
+
+    def __init__(self, window=FPS * 10):
+        self.frames_total = 0
+        self.frame_time_sum = 0.0
+        self.bucket_counts = [0] * (len(FRAME_BUCKETS) + 1)
+        self.recent = deque(maxlen=window)  # Last few seconds for FPS/quantiles
+
+    def record_frame(self, dt):
+        self.frames_total += 1
+        self.frame_time_sum += dt
+        self.bucket_counts[bisect_left(FRAME_BUCKETS, dt)] += 1
+        self.recent.append(dt)
+
+    def recent_fps(self, recent):
+        total = sum(recent)
+        return len(recent) / total if total > 0 else 0.0
+
+    def recent_quantiles(self, recent):
+        ordered = sorted(recent)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+
+class EventMetrics:
+    """Wave and boss gauges kept current by gameplay events instead of polling"""
+
+    def __init__(self, events):
+        self.events = events
+        self.wave = 0
+        self.boss_phase = 0  # 0 while no boss is alive
+        events.subscribe(WAVE_STARTED, self.on_wave_started)
+        events.subscribe(BOSS_SPAWNED, self.on_boss_spawned)
+        events.subscribe(BOSS_PHASE_CHANGED, self.on_boss_phase_changed)
+        events.subscribe(BOSS_DEFEATED, self.on_boss_defeated)
+
+    def on_wave_started(self, wave_number, max_waves, name, is_boss_wave):
+        self.wave = wave_number
+        self.boss_phase = 0
+
+    def on_boss_spawned(self, boss): self.boss_phase = boss.phase
+
+    def on_boss_phase_changed(self, boss, old_phase, new_phase): self.boss_phase = new_phase
+
+    def on_boss_defeated(self, boss): self.boss_phase = 0
+
+
+class MetricsExporter:
+    """Renders game state snapshots in the Prometheus text exposition format"""
+
+    def __init__(self, game, frame_metrics, event_metrics):
+        self.game = game
+        self.frame_metrics = frame_metrics
+        self.event_metrics = event_metrics
+
+    def collect(self):
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        frames = self.frame_metrics
+        recent = list(frames.recent)
+        metric('striker_fps', 'gauge', "Frames per second over the last few seconds.",
+               [({}, round(frames.recent_fps(recent), 2))])
+        metric('striker_frame_time_seconds', 'gauge', "Recent frame time quantiles.",
+               [({'quantile': q}, value) for q, value in frames.recent_quantiles(recent).items()])
+
+        # Cumulative histogram over the whole run
+        metric('striker_frame_seconds', 'histogram', "Frame time since startup.", [])
+        cumulative = 0
+        for le, count in zip(FRAME_BUCKETS + ('+Inf',), list(frames.bucket_counts)):
+            cumulative += count
+            lines.append(f'striker_frame_seconds_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"striker_frame_seconds_sum {frames.frame_time_sum}")
+        lines.append(f"striker_frame_seconds_count {frames.frames_total}")
+
+        metric('striker_quality_level', 'gauge', "Adaptive quality level (0 is full quality).",
+               [({'name': quality.level_name}, quality.level)])
+        metric('striker_quality_changes_total', 'counter', "Quality level changes since startup.",
+               [({}, quality.changes)])
+
+        state = self.game.state_manager.current_state
+        metric('striker_entities', 'gauge', "Live sprites per group.",
+               [({'group': group}, count) for group, count in state.entity_counts().items()])
+        pool_stats = state.pool_stats()
+        if pool_stats:
+            metric('striker_pool_high_water', 'gauge', "Most objects alive at once per pool.",
+                   [({'pool': pool}, stats['high_water']) for pool, stats in pool_stats.items()])
+            metric('striker_pool_free', 'gauge', "Objects waiting for reuse per pool.",
+                   [({'pool': pool}, stats['free']) for pool, stats in pool_stats.items()])
+
+        cull_stats = state.cull_stats()
+        if cull_stats:
+            metric('striker_culled_total', 'counter', "Entities removed off screen per kind.",
+                   [({'kind': kind}, stats['total']) for kind, stats in cull_stats.items()])
+
+        network_monitor = getattr(self.game, 'network_monitor', None)
+        if network_monitor:
+            metric('striker_packets_total', 'counter', "Captured packets by type.",
+                   [({'type': packet_type}, count) for packet_type, count in network_monitor.get_stats().items()])
+            spawn_stats = network_monitor.get_spawn_stats()
+            metric('striker_network_spawns_total', 'counter', "Network spawn requests by rate limiter outcome.",
+                   [({'type': packet_type, 'result': result}, count)
+                    for result, counts in spawn_stats.items() for packet_type, count in counts.items()])
+
+        event_metrics = self.event_metrics
+        metric('striker_wave', 'gauge', "Current wave number.", [({}, event_metrics.wave)])
+        metric('striker_boss_phase', 'gauge', "Current boss phase (0 when no boss is alive).",
+               [({}, event_metrics.boss_phase)])
+        counts = event_metrics.events.counts
+        metric('striker_events_total', 'counter', "Gameplay events published since startup.",
+               [({'event': event_type}, counts[event_type]) for event_type in EVENT_TYPES])
+
+        lines.append('')
+        return '\n'.join(lines)
+
+
+class MetricsServer(threading.Thread):
+    """Serves /metrics on localhost from a background thread"""
+
+    def __init__(self, exporter, host=METRICS_HOST, port=METRICS_PORT):
+        super().__init__(daemon=True, name="MetricsServer")
+        exporter_ref = exporter
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = exporter_ref.collect().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes would flood the console otherwise
+
+        self.httpd = HTTPServer((host, port), Handler)
+
+    def run(self):
+        host, port = self.httpd.server_address[:2]
+        print(f"📈 Metrics endpoint: http://{host}:{port}/metrics")
+        self.httpd.serve_forever()
+
+    def stop(self):
+        """Shut down the HTTP server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
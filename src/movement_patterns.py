@@ -1,14 +1,34 @@
 import math
+import numpy as np
 import pygame
 from src.settings import *
 
+def attribute_array(objects, name):
+    """Float array of one attribute across objects"""
+    return np.fromiter((getattr(obj, name) for obj in objects), float, len(objects))
+
 class MovementPattern:
     """Base class for movement patterns"""
+    # One pattern per enemy, so instances are slotted; subclasses list their own fields
+    __slots__ = ('batch_ready',)
+
+    def __init__(self):
+        # True once the pattern has captured its starting state and MovementBatch
+        # may advance it; patterns without batch_* methods never set it
+        self.batch_ready = False
+
     def update(self, dt, enemy):
         pass
 
+    def reset(self):
+        """Forget per-enemy state so a pooled enemy can reuse the pattern"""
+        pass
+
 class StraightMovement(MovementPattern):
+    __slots__ = ('speed', 'direction')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 100)
         self.direction = pygame.math.Vector2(config.get('direction_x', 0), config.get('direction_y', 1))
         if self.direction.magnitude() > 0:
@@ -16,43 +36,123 @@ class StraightMovement(MovementPattern):
         
     def update(self, dt, enemy):
         enemy.pos += self.direction * self.speed * dt
+        self.batch_ready = True
+
+    def reset(self):
+        self.batch_ready = False
+
+    @staticmethod
+    def batch_gather(enemies):
+        movements = [enemy.movement for enemy in enemies]
+        return {
+            'x': attribute_array([enemy.pos for enemy in enemies], 'x'),
+            'y': attribute_array([enemy.pos for enemy in enemies], 'y'),
+            'vx': attribute_array([m.direction for m in movements], 'x') * attribute_array(movements, 'speed'),
+            'vy': attribute_array([m.direction for m in movements], 'y') * attribute_array(movements, 'speed'),
+        }
+
+    @staticmethod
+    def batch_step(state, dt):
+        state['x'] += state['vx'] * dt
+        state['y'] += state['vy'] * dt
+        return state['x'], state['y']
 
 class SineWaveMovement(MovementPattern):
+    __slots__ = ('speed', 'amplitude', 'frequency', 'initial_x')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 150)
         self.amplitude = config.get('amplitude', 60)
         self.frequency = config.get('frequency', 2)
         self.initial_x = None
         
+    def reset(self):
+        self.initial_x = None
+        self.batch_ready = False
+        
     def update(self, dt, enemy):
         if self.initial_x is None:
             self.initial_x = enemy.pos.x
             
         enemy.pos.y += self.speed * dt
         enemy.pos.x = self.initial_x + self.amplitude * math.sin(enemy.age * self.frequency)
+        self.batch_ready = True
+
+    @staticmethod
+    def batch_gather(enemies):
+        movements = [enemy.movement for enemy in enemies]
+        return {
+            'age': attribute_array(enemies, 'age'),
+            'y': attribute_array([enemy.pos for enemy in enemies], 'y'),
+            'initial_x': attribute_array(movements, 'initial_x'),
+            'speed': attribute_array(movements, 'speed'),
+            'amplitude': attribute_array(movements, 'amplitude'),
+            'frequency': attribute_array(movements, 'frequency'),
+        }
+
+    @staticmethod
+    def batch_step(state, dt):
+        state['age'] += dt
+        state['y'] += state['speed'] * dt
+        return state['initial_x'] + state['amplitude'] * np.sin(state['age'] * state['frequency']), state['y']
 
 class CosineWaveMovement(MovementPattern):
+    __slots__ = ('speed', 'amplitude', 'frequency', 'initial_x')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 150)
         self.amplitude = config.get('amplitude', 60)
         self.frequency = config.get('frequency', 2)
         self.initial_x = None
         
+    def reset(self):
+        self.initial_x = None
+        self.batch_ready = False
+        
     def update(self, dt, enemy):
         if self.initial_x is None:
             self.initial_x = enemy.pos.x
             
         enemy.pos.y += self.speed * dt
         enemy.pos.x = self.initial_x + self.amplitude * math.cos(enemy.age * self.frequency)
+        self.batch_ready = True
+
+    @staticmethod
+    def batch_gather(enemies):
+        movements = [enemy.movement for enemy in enemies]
+        return {
+            'age': attribute_array(enemies, 'age'),
+            'y': attribute_array([enemy.pos for enemy in enemies], 'y'),
+            'initial_x': attribute_array(movements, 'initial_x'),
+            'speed': attribute_array(movements, 'speed'),
+            'amplitude': attribute_array(movements, 'amplitude'),
+            'frequency': attribute_array(movements, 'frequency'),
+        }
+
+    @staticmethod
+    def batch_step(state, dt):
+        state['age'] += dt
+        state['y'] += state['speed'] * dt
+        return state['initial_x'] + state['amplitude'] * np.cos(state['age'] * state['frequency']), state['y']
 
 class DiveMovement(MovementPattern):
+    __slots__ = ('speed', 'dive_y', 'dive_speed_multiplier', 'state', 'direction')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 120)
         self.dive_y = config.get('dive_y', 100)
         self.dive_speed_multiplier = config.get('dive_speed_multiplier', 1.5)
         self.state = 'down'
         self.direction = None
         
+    def reset(self):
+        self.state = 'down'
+        self.direction = None
+        self.batch_ready = False
+        
     def update(self, dt, enemy):
         if self.state == 'down':
             enemy.pos.y += self.speed * dt
@@ -65,17 +165,46 @@ class DiveMovement(MovementPattern):
                     self.direction = direction_to_player.normalize()
                 else:
                     self.direction = pygame.math.Vector2(0, 1)
+                # The dive is a straight line from here on
+                self.batch_ready = True
         elif self.state == 'dive':
             if self.direction:
                 enemy.pos += self.direction * self.speed * self.dive_speed_multiplier * dt
 
+    @staticmethod
+    def batch_gather(enemies):
+        movements = [enemy.movement for enemy in enemies]
+        speed = attribute_array(movements, 'speed')
+        multiplier = attribute_array(movements, 'dive_speed_multiplier')
+        return {
+            'x': attribute_array([enemy.pos for enemy in enemies], 'x'),
+            'y': attribute_array([enemy.pos for enemy in enemies], 'y'),
+            'vx': attribute_array([m.direction for m in movements], 'x') * speed * multiplier,
+            'vy': attribute_array([m.direction for m in movements], 'y') * speed * multiplier,
+        }
+
+    @staticmethod
+    def batch_step(state, dt):
+        state['x'] += state['vx'] * dt
+        state['y'] += state['vy'] * dt
+        return state['x'], state['y']
+
 class CircularMovement(MovementPattern):
+    __slots__ = ('radius', 'angular_speed', 'center_speed', 'center', 'start_angle', 'angle')
+
     def __init__(self, config):
+        super().__init__()
         self.radius = config.get('radius', 80)
         self.angular_speed = config.get('angular_speed', 2)  # radians per second
         self.center_speed = config.get('center_speed', 50)  # speed at which center moves down
         self.center = None
-        self.angle = config.get('start_angle', 0)
+        self.start_angle = config.get('start_angle', 0)
+        self.angle = self.start_angle
+        
+    def reset(self):
+        self.center = None
+        self.angle = self.start_angle
+        self.batch_ready = False
         
     def update(self, dt, enemy):
         if self.center is None:
@@ -90,15 +219,49 @@ class CircularMovement(MovementPattern):
         # Calculate position on circle
         enemy.pos.x = self.center.x + self.radius * math.cos(self.angle)
         enemy.pos.y = self.center.y + self.radius * math.sin(self.angle)
+        self.batch_ready = True
+
+    @staticmethod
+    def batch_gather(enemies):
+        movements = [enemy.movement for enemy in enemies]
+        return {
+            'center_x': attribute_array([m.center for m in movements], 'x'),
+            'center_y': attribute_array([m.center for m in movements], 'y'),
+            'angle': attribute_array(movements, 'angle'),
+            'radius': attribute_array(movements, 'radius'),
+            'angular_speed': attribute_array(movements, 'angular_speed'),
+            'center_speed': attribute_array(movements, 'center_speed'),
+        }
+
+    @staticmethod
+    def batch_step(state, dt):
+        state['center_y'] += state['center_speed'] * dt
+        state['angle'] += state['angular_speed'] * dt
+        return (state['center_x'] + state['radius'] * np.cos(state['angle']),
+                state['center_y'] + state['radius'] * np.sin(state['angle']))
+
+    @staticmethod
+    def batch_flush(movements, state):
+        for movement, center_y, angle in zip(movements, state['center_y'].tolist(), state['angle'].tolist()):
+            movement.center.y = center_y
+            movement.angle = angle
 
 class ZigZagMovement(MovementPattern):
+    __slots__ = ('speed', 'zigzag_width', 'zigzag_frequency', 'initial_x', 'direction')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 120)
         self.zigzag_width = config.get('zigzag_width', 100)
         self.zigzag_frequency = config.get('zigzag_frequency', 3)
         self.initial_x = None
         self.direction = 1
         
+    def reset(self):
+        self.initial_x = None
+        self.direction = 1
+        self.batch_ready = False
+        
     def update(self, dt, enemy):
         if self.initial_x is None:
             self.initial_x = enemy.pos.x
@@ -113,9 +276,42 @@ class ZigZagMovement(MovementPattern):
             self.direction = -1
             
         enemy.pos.x = self.initial_x + (self.zigzag_width / 2) * self.direction
+        self.batch_ready = True
+
+    @staticmethod
+    def batch_gather(enemies):
+        movements = [enemy.movement for enemy in enemies]
+        return {
+            'age': attribute_array(enemies, 'age'),
+            'y': attribute_array([enemy.pos for enemy in enemies], 'y'),
+            'initial_x': attribute_array(movements, 'initial_x'),
+            'half_width': attribute_array(movements, 'zigzag_width') / 2,
+            'speed': attribute_array(movements, 'speed'),
+            'frequency': attribute_array(movements, 'zigzag_frequency'),
+            'direction': attribute_array(movements, 'direction'),
+        }
+
+    @staticmethod
+    def batch_step(state, dt):
+        state['age'] += dt
+        state['y'] += state['speed'] * dt
+        wave = np.sin(state['age'] * state['frequency'])
+        direction = state['direction']
+        # Same hysteresis as update(): keep the direction while sin is exactly 0
+        direction[(wave > 0) & (direction == -1)] = 1
+        direction[(wave < 0) & (direction == 1)] = -1
+        return state['initial_x'] + state['half_width'] * direction, state['y']
+
+    @staticmethod
+    def batch_flush(movements, state):
+        for movement, direction in zip(movements, state['direction'].tolist()):
+            movement.direction = int(direction)
 
 class BossHoverMovement(MovementPattern):
+    __slots__ = ('speed', 'amplitude', 'frequency', 'initial_pos', 'hover_y')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 50)
         self.amplitude = config.get('amplitude', 80)
         self.frequency = config.get('frequency', 0.8)
@@ -136,7 +332,10 @@ class BossHoverMovement(MovementPattern):
         enemy.pos.x = max(60, min(screen_width - 60, enemy.pos.x))
 
 class BossTeleportMovement(MovementPattern):
+    __slots__ = ('speed', 'teleport_frequency', 'last_teleport', 'target_pos', 'moving_to_target')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 80)
         self.teleport_frequency = config.get('teleport_frequency', 4.0)
         self.last_teleport = 0
@@ -169,7 +368,10 @@ class BossTeleportMovement(MovementPattern):
         self.moving_to_target = True
 
 class BossFortressMovement(MovementPattern):
+    __slots__ = ('speed', 'settled', 'target_y')
+
     def __init__(self, config):
+        super().__init__()
         self.speed = config.get('speed', 30)
         self.settled = False
         self.target_y = 100
@@ -191,28 +393,86 @@ class BossFortressMovement(MovementPattern):
             # Very slow side-to-side movement
             enemy.pos.x += self.speed * 0.5 * math.sin(enemy.age * 0.3) * dt
 
+MOVEMENT_PATTERNS = {
+    'straight': StraightMovement,
+    'sine_wave': SineWaveMovement,
+    'cosine_wave': CosineWaveMovement,
+    'dive': DiveMovement,
+    'circular': CircularMovement,
+    'zigzag': ZigZagMovement,
+    'boss_hover': BossHoverMovement,
+    'boss_teleport': BossTeleportMovement,
+    'boss_fortress': BossFortressMovement,
+}
+
 def create_movement_pattern(config):
     """Factory function to create movement patterns"""
     pattern_type = config.get('type', 'straight')
-    
-    if pattern_type == 'straight':
-        return StraightMovement(config)
-    elif pattern_type == 'sine_wave':
-        return SineWaveMovement(config)
-    elif pattern_type == 'cosine_wave':
-        return CosineWaveMovement(config)
-    elif pattern_type == 'dive':
-        return DiveMovement(config)
-    elif pattern_type == 'circular':
-        return CircularMovement(config)
-    elif pattern_type == 'zigzag':
-        return ZigZagMovement(config)
-    elif pattern_type == 'boss_hover':
-        return BossHoverMovement(config)
-    elif pattern_type == 'boss_teleport':
-        return BossTeleportMovement(config)
-    elif pattern_type == 'boss_fortress':
-        return BossFortressMovement(config)
-    else:
-        # Default to straight movement
-        return StraightMovement(config)
\ No newline at end of file
+    # Default to straight movement
+    return MOVEMENT_PATTERNS.get(pattern_type, StraightMovement)(config)
+
+
+class MovementBatch:
+    """
+    Advances enemies with closed-form movement patterns in bulk.
+
+    Enemies whose pattern is batch_ready are grouped by pattern class, and
+    each group is stepped with one set of NumPy operations per frame. The
+    per-enemy arrays are kept between frames while a group's membership is
+    unchanged; pattern state that lives only in the arrays is written back
+    (batch_flush) before a group is regathered, so update() can take over
+    again at any time. Enemies moved here are flagged `batched` and skip
+    their own movement.update() for the frame.
+    """
+
+    def __init__(self):
+        self.groups = {}  # pattern class -> (enemies, movements, state)
+        self.count = 0  # Enemies moved by the last update
+
+    def update(self, dt, enemies):
+        buckets = {}
+        for enemy in enemies:
+            movement = enemy.movement
+            # Facing sprites need the per-frame motion delta, so they stay on update()
+            if movement.batch_ready and not enemy.face_movement:
+                members = buckets.get(type(movement))
+                if members is None:
+                    buckets[type(movement)] = [enemy]
+                else:
+                    members.append(enemy)
+
+        groups = {}
+        count = 0
+        for pattern_class, members in buckets.items():
+            cached = self.groups.pop(pattern_class, None)
+            if cached is not None and cached[0] == members:
+                movements, state = cached[1], cached[2]
+            else:
+                if cached is not None:
+                    self.flush(pattern_class, cached)
+                movements = [enemy.movement for enemy in members]
+                state = pattern_class.batch_gather(members)
+            xs, ys = pattern_class.batch_step(state, dt)
+            for enemy, x, y in zip(members, xs.tolist(), ys.tolist()):
+                enemy.pos.update(x, y)
+                enemy.batched = True
+            groups[pattern_class] = (members, movements, state)
+            count += len(members)
+        for pattern_class, cached in self.groups.items():
+            self.flush(pattern_class, cached)
+        self.groups = groups
+        self.count = count
+
+    def flush(self, pattern_class, cached):
+        """Write array-only state back to the patterns of a dissolved group."""
+        batch_flush = getattr(pattern_class, 'batch_flush', None)
+        if batch_flush is None:
+            return
+        _, movements, state = cached
+        # Patterns reset since (pooled enemies) have started over; leave them alone
+        live = np.fromiter((movement.batch_ready for movement in movements), bool, len(movements))
+        if live.all():
+            batch_flush(movements, state)
+        else:
+            batch_flush([m for m, keep in zip(movements, live) if keep],
+                        {key: values[live] for key, values in state.items()})
@@ -3,6 +3,17 @@ import time
 import pygame
 from scapy.all import sniff, TCP, ICMP, ARP, UDP
 from src.settings import ENEMY_SPAWN_EVENT, PACKET_TO_ENEMY_MAP, NETWORK_SPAWN_COOLDOWN
+from src.tracing import traced
+
+# Checked in this order; a packet counts as the first of these layers it has
+PACKET_LAYERS = (('tcp', TCP), ('icmp', ICMP), ('arp', ARP), ('udp', UDP))
+
+def classify_packet(packet):
+    """Packet type ('tcp', 'icmp', 'arp' or 'udp') of a scapy packet, or None"""
+    for packet_type, layer in PACKET_LAYERS:
+        if packet.haslayer(layer):
+            return packet_type
+    return None
 
 class NetworkMonitor(threading.Thread):
     """
@@ -16,35 +27,26 @@ class NetworkMonitor(threading.Thread):
     """
     
     def __init__(self, interface=None, spawn_cooldown=NETWORK_SPAWN_COOLDOWN):
-        super().__init__(daemon=True)
+        super().__init__(daemon=True, name="NetworkMonitor")
         self.stop_event = threading.Event()
         self.spawn_cooldown = spawn_cooldown
         self.last_spawn_time = {}  # Track last spawn time per enemy type
         self.interface = interface
         self.packet_count = {'tcp': 0, 'icmp': 0, 'arp': 0, 'udp': 0}
+        # Spawn requests that passed / failed the cooldown, per packet type
+        self.spawn_admitted = {'tcp': 0, 'icmp': 0, 'arp': 0, 'udp': 0}
+        self.spawn_rejected = {'tcp': 0, 'icmp': 0, 'arp': 0, 'udp': 0}
         
         # Initialize last spawn times
         for packet_type in PACKET_TO_ENEMY_MAP.keys():
             self.last_spawn_time[packet_type] = 0
     
+    @traced(category='network')
     def process_packet(self, packet):
         """Process captured packet and determine if enemy should be spawned."""
-        enemy_type = None
-        packet_type = None
-        
         # Determine packet type and corresponding enemy
-        if packet.haslayer(TCP):
-            packet_type = 'tcp'
-            enemy_type = PACKET_TO_ENEMY_MAP['tcp']
-        elif packet.haslayer(ICMP):
-            packet_type = 'icmp'
-            enemy_type = PACKET_TO_ENEMY_MAP['icmp']
-        elif packet.haslayer(ARP):
-            packet_type = 'arp'
-            enemy_type = PACKET_TO_ENEMY_MAP['arp']
-        elif packet.haslayer(UDP):
-            packet_type = 'udp'
-            enemy_type = PACKET_TO_ENEMY_MAP['udp']
+        packet_type = classify_packet(packet)
+        enemy_type = PACKET_TO_ENEMY_MAP.get(packet_type)
         
         if enemy_type and packet_type:
             self.packet_count[packet_type] += 1
@@ -54,6 +56,7 @@ class NetworkMonitor(threading.Thread):
             # Rate limiting: only spawn if cooldown has passed
             if current_time - last_time > self.spawn_cooldown:
                 self.last_spawn_time[packet_type] = current_time
+                self.spawn_admitted[packet_type] += 1
                 
                 # Create and post the custom event to pygame
                 try:
@@ -70,6 +73,8 @@ class NetworkMonitor(threading.Thread):
                 except:
                     # If pygame isn't initialized yet, just skip
                     pass
+            else:
+                self.spawn_rejected[packet_type] += 1
     
     def run(self):
         """Main thread execution - start packet sniffing."""
@@ -100,4 +105,11 @@ class NetworkMonitor(threading.Thread):
     
     def get_stats(self):
         """Get packet capture statistics."""
-        return self.packet_count.copy()
\ No newline at end of file
+        return self.packet_count.copy()
+    
+    def get_spawn_stats(self):
+        """Get spawn admit/reject counts from the cooldown rate limiter."""
+        return {
+            'admitted': self.spawn_admitted.copy(),
+            'rejected': self.spawn_rejected.copy()
+        }
\ No newline at end of file
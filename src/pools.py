@@ -0,0 +1,83 @@
+import pygame
+
+class PooledSprite(pygame.sprite.Sprite):
+    """
+    Sprite that goes back to its pool when killed.
+
+    Subclasses implement reset() taking the same leading arguments the pool
+    passes to acquire(), and put the sprite back into its just-constructed
+    state without allocating new components.
+    """
+    __slots__ = ('pool', 'pooled')
+
+    def __init__(self, *groups):
+        self.pool = None
+        self.pooled = False  # True while waiting in the pool's free list
+        super().__init__(*groups)
+
+    def reset(self, *args):
+        raise NotImplementedError
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+class SpritePool:
+    """
+    Free list of sprites of one type.
+
+    acquire() reuses a released sprite through reset() when one is
+    available and only calls the factory otherwise. Every sprite from the
+    pool belongs to the same groups, which are re-joined in a single add()
+    on reuse.
+    """
+
+    def __init__(self, name, factory, groups):
+        self.name = name
+        self.factory = factory
+        self.groups = groups
+        self.free = []
+        self.created = 0
+        self.active = 0
+        self.high_water = 0  # Most sprites alive at once
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.pooled = False
+            sprite.reset(*args)
+            sprite.add(self.groups)
+        else:
+            sprite = self.factory(*args)
+            sprite.pool = self
+            self.created += 1
+        self.active += 1
+        if self.active > self.high_water:
+            self.high_water = self.active
+        return sprite
+
+    def stock(self, *args):
+        """Build one sprite straight into the free list, ahead of the spawn that needs it."""
+        sprite = self.factory(*args)
+        sprite.pool = self
+        self.created += 1
+        self.active += 1
+        sprite.kill()  # Leaves its groups and comes back through release()
+
+    def release(self, sprite):
+        """Take back a killed sprite; repeated kills are ignored."""
+        if sprite.pooled:
+            return
+        sprite.pooled = True
+        self.free.append(sprite)
+        self.active -= 1
+
+    def stats(self):
+        return {
+            'active': self.active,
+            'free': len(self.free),
+            'created': self.created,
+            'high_water': self.high_water,
+        }
@@ -1,5 +1,7 @@
 import pygame
 from src.settings import *
+from src.pools import PooledSprite
+from src.game_clock import game_clock
 import random
 
 POWERUP_SPEED = 100
@@ -8,12 +10,12 @@ POWERUP_SPEED = 100
 class PowerUpEffect:
     def __init__(self, duration=0):
         self.duration = duration
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = game_clock.get_ticks()
 
     def is_active(self):
         if self.duration == 0:  # 0 duration means permanent until broken/replaced
             return True
-        return pygame.time.get_ticks() - self.start_time < self.duration
+        return game_clock.get_ticks() - self.start_time < self.duration
 
     def apply(self, player):
         raise NotImplementedError
@@ -65,22 +67,28 @@ class EnergyShieldEffect(PowerUpEffect):
         player.shield_health = 0
 
 # Power-up sprite that falls from the screen
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(PooledSprite):
+    __slots__ = ('asset_manager', 'pos', 'powerup_type', 'image', 'rect')
     POWERUP_TYPES = ['rapid_fire', 'spread_shot', 'shield']
+    velocity = pygame.math.Vector2(0, POWERUP_SPEED)  # Shared; every power-up falls the same way
 
     def __init__(self, pos, asset_manager, groups):
         super().__init__(groups)
+        self.asset_manager = asset_manager
+        self.pos = pygame.math.Vector2()
+        self.rect = pygame.Rect(0, 0, 0, 0)  # Resized and moved in place by reset()
+        self.reset(pos)
+
+    def reset(self, pos):
         self.powerup_type = random.choice(self.POWERUP_TYPES)
         
-        self.image = asset_manager.get_image(self.powerup_type)
-        self.rect = self.image.get_rect(center=pos)
+        self.image = self.asset_manager.get_image(self.powerup_type)
+        self.rect.size = self.image.get_size()
+        self.rect.center = pos
         
-        self.pos = pygame.math.Vector2(self.rect.center)
-        self.velocity = pygame.math.Vector2(0, POWERUP_SPEED)
+        self.pos.update(self.rect.center)
 
     def update(self, dt):
         self.pos += self.velocity * dt
         self.rect.center = (round(self.pos.x), round(self.pos.y))
-        
-        if self.rect.top > SCREEN_HEIGHT:
-            self.kill()
\ No newline at end of file
+        # Falling off the screen is handled by GameplayState's culling pass
\ No newline at end of file
@@ -0,0 +1,243 @@
+import csv
+import gc
+import sys
+import time
+from collections import deque
+import pygame
+from src.settings import *
+from src.quality import quality
+
+# Phases shown in the overlay, in the order they run in a frame
+PHASES = ('handle_events', 'sprites_update', 'wave_update', 'collisions', 'draw', 'draw_ui', 'flip')
+PHASE_COLORS = {
+    'handle_events': (200, 200, 200),
+    'sprites_update': (0, 200, 255),
+    'wave_update': (0, 255, 150),
+    'collisions': (255, 200, 0),
+    'draw': (255, 100, 100),
+    'draw_ui': (255, 120, 255),
+    'flip': (150, 150, 255),
+}
+
+class FrameProfiler:
+    """
+    Per-phase frame timer with an F3 overlay and optional CSV export.
+
+    Every call site is guarded by `enabled`, so when the overlay is off a
+    phase marker costs one attribute lookup.
+    """
+
+    def __init__(self, history=240, average_frames=30):
+        self.enabled = False
+        self.history = history
+        self.average_frames = average_frames
+        self.frame_budget = 1.0 / FPS
+
+        self.frame_number = 0
+        self.frame_start = 0.0
+        self.last_frame_start = 0.0
+        self.starts = {}
+        self.phase_times = {}
+        self.phase_history = {phase: deque(maxlen=history) for phase in PHASES}
+        self.frame_times = deque(maxlen=history)     # work time per frame (seconds)
+        self.frame_intervals = deque(maxlen=history) # wall time between frames (seconds)
+        self.block_history = deque(maxlen=history)   # net change in allocated blocks per frame
+        self.gc_history = deque(maxlen=history)
+        self.entity_counts = {}
+        self.pool_stats = {}
+        self.cull_stats = {}
+        self.present_stats = None  # (mode, rects, screen fraction) while dirty rects are on
+
+        self.allocated_blocks = 0
+        self.gc_collections = 0
+        self.csv_rows = None  # list while recording
+
+        self.font = None
+        self.panel = None
+
+    def toggle(self):
+        """Turn the profiler and its overlay on or off (F3)."""
+        self.enabled = not self.enabled
+        if self.enabled:
+            gc.callbacks.append(self.on_gc)
+            self.allocated_blocks = sys.getallocatedblocks()
+            self.last_frame_start = 0.0
+            self.starts.clear()
+        else:
+            if self.on_gc in gc.callbacks:
+                gc.callbacks.remove(self.on_gc)
+            if self.csv_rows is not None:
+                self.stop_csv()
+
+    def on_gc(self, phase, info):
+        if phase == 'start':
+            self.gc_collections += 1
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.last_frame_start:
+            self.frame_intervals.append(now - self.last_frame_start)
+        self.last_frame_start = self.frame_start = now
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+
+    def begin(self, phase):
+        if self.enabled:
+            self.starts[phase] = time.perf_counter()
+
+    def end(self, phase):
+        if self.enabled:
+            start = self.starts.pop(phase, None)
+            # The profiler may have been switched on in the middle of a phase
+            if start is not None and self.phase_times:
+                self.phase_times[phase] += time.perf_counter() - start
+
+    def end_frame(self, state, renderer=None):
+        """Record the finished frame. `state` supplies the entity counts."""
+        if not self.enabled or not self.frame_start:
+            return
+        frame_time = time.perf_counter() - self.frame_start
+        # Net growth only: a frame that allocates and frees the same objects shows ~0.
+        # Short-lived churn shows up as gc runs instead.
+        blocks = sys.getallocatedblocks()
+        block_growth = blocks - self.allocated_blocks
+        self.allocated_blocks = blocks
+
+        self.frame_number += 1
+        self.frame_times.append(frame_time)
+        for phase in PHASES:
+            self.phase_history[phase].append(self.phase_times.get(phase, 0.0))
+        self.block_history.append(block_growth)
+        self.gc_history.append(self.gc_collections)
+        self.gc_collections = 0
+        self.entity_counts = state.entity_counts()
+        self.pool_stats = state.pool_stats()
+        self.cull_stats = state.cull_stats()
+        if renderer is not None and renderer.enabled:
+            self.present_stats = (renderer.last_mode, renderer.last_rects, renderer.last_area)
+        else:
+            self.present_stats = None
+
+        if self.csv_rows is not None:
+            row = {'frame': self.frame_number, 'frame_ms': round(frame_time * 1000, 4)}
+            for phase in PHASES:
+                row[f'{phase}_ms'] = round(self.phase_times.get(phase, 0.0) * 1000, 4)
+            row['net_blocks'] = block_growth
+            row['gc_collections'] = self.gc_history[-1]
+            row['quality_level'] = quality.level
+            row.update(self.entity_counts)
+            self.csv_rows.append(row)
+
+    # --- CSV export ---
+    def toggle_csv(self):
+        """Start or stop recording frame rows for CSV export (F4)."""
+        if not self.enabled:
+            return
+        if self.csv_rows is None:
+            self.csv_rows = []
+            print("Profiler: CSV recording started")
+        else:
+            self.stop_csv()
+
+    def stop_csv(self, path=None):
+        """Write the recorded rows to a CSV file and stop recording."""
+        rows, self.csv_rows = self.csv_rows, None
+        if not rows:
+            return None
+        path = path or time.strftime('profile_%Y%m%d_%H%M%S.csv')
+        fieldnames = []
+        for row in rows:
+            for key in row:
+                if key not in fieldnames:
+                    fieldnames.append(key)
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, restval=0)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Profiler: wrote {len(rows)} frames to {path}")
+        return path
+
+    # --- Overlay ---
+    def average(self, samples):
+        recent = list(samples)[-self.average_frames:]
+        return sum(recent) / len(recent) if recent else 0.0
+
+    def draw(self, screen):
+        """Draw the overlay panel in the top right corner and return its rect."""
+        if not self.enabled:
+            return None
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+            self.panel = pygame.Surface((380, 500), pygame.SRCALPHA)
+
+        panel = self.panel
+        panel.fill((0, 0, 0, 180))
+        font = self.font
+        budget_ms = self.frame_budget * 1000
+        y = 6
+
+        interval = self.average(self.frame_intervals)
+        fps = 1.0 / interval if interval else 0.0
+        frame_ms = self.average(self.frame_times) * 1000
+        ordered = sorted(self.frame_times)
+        p95_ms = ordered[int(len(ordered) * 0.95)] * 1000 if ordered else 0.0
+        header = f"FPS {fps:5.1f}   frame {frame_ms:5.2f} ms   p95 {p95_ms:5.2f} ms"
+        panel.blit(font.render(header, True, WHITE), (8, y)); y += 22
+
+        # Per-phase bars, scaled to the frame budget
+        bar_x, bar_width = 120, 180
+        for phase in PHASES:
+            phase_ms = self.average(self.phase_history[phase]) * 1000
+            panel.blit(font.render(phase, True, WHITE), (8, y))
+            width = min(bar_width, int(bar_width * phase_ms / budget_ms))
+            pygame.draw.rect(panel, (60, 60, 60), (bar_x, y + 2, bar_width, 12))
+            if width > 0:
+                pygame.draw.rect(panel, PHASE_COLORS[phase], (bar_x, y + 2, width, 12))
+            panel.blit(font.render(f"{phase_ms:6.2f}", True, WHITE), (bar_x + bar_width + 8, y))
+            y += 18
+
+        # Rolling frame-time graph with the frame budget as a reference line
+        y += 6
+        graph_rect = pygame.Rect(8, y, 364, 100)
+        pygame.draw.rect(panel, (30, 30, 30), graph_rect)
+        scale = graph_rect.height / (budget_ms * 2)
+        budget_y = graph_rect.bottom - int(budget_ms * scale)
+        pygame.draw.line(panel, (0, 150, 0), (graph_rect.left, budget_y), (graph_rect.right, budget_y))
+        if len(self.frame_times) > 1:
+            step = graph_rect.width / (self.history - 1)
+            points = [
+                (graph_rect.left + i * step,
+                 graph_rect.bottom - min(graph_rect.height, int(t * 1000 * scale)))
+                for i, t in enumerate(self.frame_times)
+            ]
+            pygame.draw.lines(panel, YELLOW, False, points)
+        y = graph_rect.bottom + 8
+
+        block_growth = self.average(self.block_history)
+        gc_runs = sum(self.gc_history)
+        panel.blit(font.render(f"net blocks/frame {block_growth:+.0f}   gc runs ({len(self.gc_history)}f) {gc_runs}", True, WHITE), (8, y)); y += 20
+
+        for name, count in self.entity_counts.items():
+            panel.blit(font.render(f"{name}: {count}", True, WHITE), (8, y)); y += 16
+
+        for name, stats in self.pool_stats.items():
+            text = f"pool {name}: {stats['active']} live  {stats['free']} free  peak {stats['high_water']}"
+            panel.blit(font.render(text, True, WHITE), (8, y)); y += 16
+
+        if self.cull_stats:
+            text = "culled: " + "  ".join(f"{kind} {stats['total']}" for kind, stats in self.cull_stats.items())
+            panel.blit(font.render(text, True, WHITE), (8, y)); y += 16
+
+        if quality.enabled:
+            panel.blit(font.render(f"quality: level {quality.level} ({quality.level_name})  changes {quality.changes}", True,
+                                   WHITE if quality.level == 0 else YELLOW), (8, y)); y += 16
+
+        if self.present_stats:
+            mode, rects, area = self.present_stats
+            panel.blit(font.render(f"present: {mode}  {rects} rects  {area:.0%} of screen", True, WHITE), (8, y)); y += 16
+
+        if self.csv_rows is not None:
+            panel.blit(font.render(f"CSV recording ({len(self.csv_rows)} frames) - F4 to save", True, RED), (8, panel.get_height() - 20))
+
+        return screen.blit(panel, (screen.get_width() - panel.get_width() - 10, 10))
@@ -0,0 +1,91 @@
+from collections import deque
+import pygame
+from src.tracing import instant
+from src.settings import *
+
+# Quality levels, cheapest last; every level keeps the savings of the ones before it
+QUALITY_LEVELS = ('full', 'no_flash', 'shield_pulse', 'hud_rate', 'static_shield', 'audio_voices')
+
+class QualityGovernor:
+    """
+    Trades visuals for frame time when the game falls behind.
+
+    Game.run reports the work time of every frame (everything but the
+    clock sleep). When the rolling average climbs past QUALITY_DEGRADE_AT
+    of the frame budget, the governor drops one level; once it stays under
+    QUALITY_RECOVER_AT for QUALITY_HOLD_FRAMES it climbs back one level.
+    The gap between the two thresholds and the hold keep it from
+    flip-flopping at the edge of the budget.
+
+    Effects read the flags below instead of the level itself. Every level
+    only changes what is drawn or heard, never sprite rects, so collisions
+    (and replays) play out the same at any level.
+    """
+
+    def __init__(self, enabled=QUALITY_GOVERNOR_ENABLED, window=QUALITY_WINDOW):
+        self.enabled = enabled
+        self.frame_budget = 1.0 / FPS
+        self.work_times = deque(maxlen=window)
+        self.calm_frames = 0  # Consecutive frames under the recover threshold
+        self.changes = 0
+        self.level = 0
+        self.apply()
+
+    @property
+    def level_name(self): return QUALITY_LEVELS[self.level]
+
+    def toggle(self):
+        """Turn the governor on or off (F7); off restores full quality."""
+        self.enabled = not self.enabled
+        if not self.enabled:
+            self.set_level(0)
+        print(f"Quality governor {'on' if self.enabled else 'off'}")
+
+    def record_frame(self, work_time):
+        if not self.enabled:
+            return
+        work_times = self.work_times
+        work_times.append(work_time)
+        if len(work_times) < work_times.maxlen:
+            return  # Not enough frames at this level yet
+        load = sum(work_times) / len(work_times) / self.frame_budget
+
+        if load > QUALITY_DEGRADE_AT:
+            self.calm_frames = 0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                self.set_level(self.level + 1)
+        elif load < QUALITY_RECOVER_AT and self.level > 0:
+            self.calm_frames += 1
+            if self.calm_frames >= QUALITY_HOLD_FRAMES:
+                self.set_level(self.level - 1)
+        else:
+            self.calm_frames = 0
+
+    def set_level(self, level):
+        if level == self.level:
+            return
+        instant('quality_level', old_level=self.level, new_level=level)
+        self.level = level
+        self.changes += 1
+        self.work_times.clear()
+        self.calm_frames = 0
+        self.apply()
+
+    def apply(self):
+        """Derive the per-effect settings from the level."""
+        level = self.level
+        self.flash = level < 1  # Enemy and boss hit flashes
+        self.shield_pulse_ms = QUALITY_SHIELD_PULSE_MS if level >= 2 else 0  # 0: pulse every frame
+        self.hud_interval = QUALITY_HUD_INTERVAL if level >= 3 else 1  # Frames between HUD redraws
+        self.static_shield = level >= 4  # Shield drawn from a fixed-alpha copy instead of pulsing
+        voices = QUALITY_AUDIO_VOICES if level >= 5 else AUDIO_VOICES
+        if pygame.mixer.get_init():
+            pygame.mixer.set_num_channels(voices)
+        self.voices = voices
+
+    def stats(self):
+        return {'level': self.level, 'name': self.level_name, 'changes': self.changes, 'enabled': self.enabled}
+
+
+# Shared governor; Game.run feeds it, effects read its flags
+quality = QualityGovernor()
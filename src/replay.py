@@ -0,0 +1,356 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import struct
+import time
+import zlib
+import pygame
+from src.settings import *
+from src.game_clock import game_clock
+from src.quality import quality
+from src.config_registry import CONFIG_DIR
+
+REPLAY_MAGIC = b'STRKRPL1'
+REPLAY_ENV_VAR = 'STRIKER_RECORD'  # Directory that every gameplay session is recorded into
+CHECKSUM_INTERVAL = 60  # Ticks between recorded state checksums
+CONFIG_FILES = ('enemy_config.json', 'boss_config.json', 'wave_config.json')
+
+# --- Varints ---
+def write_varint(out, value):
+    """Append an unsigned LEB128 varint to a bytearray."""
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    """Decode an unsigned varint at pos; returns (value, next pos)."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def zigzag(value): return value * 2 if value >= 0 else -value * 2 - 1
+def unzigzag(value): return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+def pack_input(move_x, move_y, fire):
+    """One byte for a tick's input: move_x/move_y in -1..1, fire flag."""
+    return (move_x + 1) * 6 + (move_y + 1) * 2 + int(bool(fire))
+
+def unpack_input(packed):
+    return packed // 6 - 1, packed % 6 // 2 - 1, bool(packed % 2)
+
+
+def config_digest(config_dir=CONFIG_DIR):
+    """Hash of the config files a replay depends on."""
+    digest = hashlib.sha1()
+    for filename in CONFIG_FILES:
+        try:
+            with open(os.path.join(config_dir, filename), 'rb') as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b'-')
+    return digest.hexdigest()[:12]
+
+def state_checksum(state):
+    """CRC32 of the simulation state that diverges first when a replay drifts."""
+    player = state.player
+    crc = zlib.crc32(struct.pack('<ddiii', player.pos.x, player.pos.y, player.health, player.lives, state.score))
+    crc = zlib.crc32(state.enemy_bullets.pos[:state.enemy_bullets.count].tobytes(), crc)
+    crc = zlib.crc32(state.player_bullets.pos[:state.player_bullets.count].tobytes(), crc)
+    for enemy in state.enemy_group:
+        crc = zlib.crc32(struct.pack('<ddi', enemy.pos.x, enemy.pos.y, int(enemy.health)), crc)
+    return crc
+
+
+class Replay:
+    """
+    A recorded gameplay session.
+
+    Streams are kept as (tick, value) changes: frame times in milliseconds
+    per tick, player input whenever it changes, network spawns, quality
+    level changes and a state checksum every CHECKSUM_INTERVAL ticks.
+    On disk each stream is a varint count followed by varint tick deltas
+    and values (frame times as zigzag deltas), after a JSON header.
+    """
+
+    def __init__(self, seed=0, character='player1'):
+        self.header = {
+            'seed': seed,
+            'character': character,
+            'config': config_digest(),
+            'enemy_types': [],
+            'packet_types': list(PACKET_TO_ENEMY_MAP),
+            'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self.frame_ms = []  # Per tick
+        self.inputs = []  # (tick, packed input)
+        self.spawns = []  # (tick, packet type index, enemy type index)
+        self.quality = []  # (tick, level)
+        self.checksums = []  # (tick, crc32) after the tick
+
+    @property
+    def ticks(self): return len(self.frame_ms)
+
+    def enemy_index(self, enemy_type):
+        enemy_types = self.header['enemy_types']
+        if enemy_type not in enemy_types:
+            enemy_types.append(enemy_type)
+        return enemy_types.index(enemy_type)
+
+    # --- Encoding ---
+    def encode(self):
+        header = json.dumps(dict(self.header, ticks=self.ticks)).encode('utf-8')
+        out = bytearray(REPLAY_MAGIC)
+        write_varint(out, len(header))
+        out += header
+
+        write_varint(out, len(self.frame_ms))
+        previous = 0
+        for ms in self.frame_ms:
+            write_varint(out, zigzag(ms - previous))
+            previous = ms
+        for stream in (self.inputs, self.spawns, self.quality, self.checksums):
+            write_varint(out, len(stream))
+            last_tick = 0
+            for tick, *values in stream:
+                write_varint(out, tick - last_tick)
+                last_tick = tick
+                for value in values:
+                    write_varint(out, value)
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise ValueError("not a replay file")
+        pos = len(REPLAY_MAGIC)
+        length, pos = read_varint(data, pos)
+        replay = cls()
+        replay.header = json.loads(data[pos:pos + length].decode('utf-8'))
+        pos += length
+
+        count, pos = read_varint(data, pos)
+        value = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            value += unzigzag(delta)
+            replay.frame_ms.append(value)
+        for stream, width in ((replay.inputs, 1), (replay.spawns, 2), (replay.quality, 1), (replay.checksums, 1)):
+            count, pos = read_varint(data, pos)
+            tick = 0
+            for _ in range(count):
+                delta, pos = read_varint(data, pos)
+                tick += delta
+                values = []
+                for _ in range(width):
+                    item, pos = read_varint(data, pos)
+                    values.append(item)
+                stream.append((tick, *values))
+        return replay
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.encode())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+
+class ReplayRecorder:
+    """
+    Records a GameplayState as it is played. Created with the state, it
+    seeds `random` and resets the game clock so playback can start from
+    the same point.
+    """
+
+    def __init__(self, state, directory):
+        self.state = state
+        self.directory = directory
+        seed = random.SystemRandom().randrange(2 ** 32)
+        random.seed(seed)
+        game_clock.reset()
+        assets = state.game.asset_manager
+        self.replay = Replay(seed, getattr(assets, 'player_character', 'player1'))
+        self.last_input = None
+        self.last_level = None
+        state.player.controller = self.record_input
+
+    def record_input(self, player):
+        controls = player.read_keys()
+        packed = pack_input(*controls)
+        if packed != self.last_input:
+            self.replay.inputs.append((self.replay.ticks, packed))
+            self.last_input = packed
+        return controls
+
+    def record_spawn(self, packet_type, enemy_type):
+        replay = self.replay
+        packet_types = replay.header['packet_types']
+        if packet_type not in packet_types:
+            packet_types.append(packet_type)
+        replay.spawns.append((replay.ticks, packet_types.index(packet_type), replay.enemy_index(enemy_type)))
+
+    def end_tick(self, dt):
+        """Close the tick that GameplayState.update just ran."""
+        replay = self.replay
+        tick = replay.ticks
+        if quality.level != self.last_level:
+            replay.quality.append((tick, quality.level))
+            self.last_level = quality.level
+        replay.frame_ms.append(round(dt * 1000))
+        if (tick + 1) % CHECKSUM_INTERVAL == 0:
+            replay.checksums.append((tick, state_checksum(self.state)))
+
+    def save(self):
+        """Write the replay file; sessions that never ticked are dropped."""
+        if not self.replay.ticks:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, time.strftime('replay_%Y%m%d_%H%M%S.rpl'))
+        self.replay.save(path)
+        print(f"Replay written to {path} ({self.replay.ticks} ticks)")
+        return path
+
+
+class ReplayPlayer:
+    """Plays a replay back on a headless game, uncapped"""
+
+    def __init__(self, game, replay):
+        self.game = game
+        self.replay = replay
+        self.input_index = 0
+        self.controls = (0, 0, False)
+        self.tick = 0
+
+    def replay_input(self, player):
+        inputs = self.replay.inputs
+        while self.input_index < len(inputs) and inputs[self.input_index][0] <= self.tick:
+            self.controls = unpack_input(inputs[self.input_index][1])
+            self.input_index += 1
+        return self.controls
+
+    def play(self, draw=True, on_frame=None):
+        """
+        Run every tick. Returns per-tick frame times (seconds) and the first
+        tick whose state checksum differs from the recording (None if all match).
+        """
+        replay, game = self.replay, self.game
+        header = replay.header
+        if header['config'] != config_digest():
+            print("Warning: config files changed since this replay was recorded; playback may diverge")
+        packet_types, enemy_types = header['packet_types'], header['enemy_types']
+        spawns = iter(replay.spawns)
+        next_spawn = next(spawns, None)
+        levels = dict(replay.quality)
+        checksums = dict(replay.checksums)
+
+        # The governor's level is part of the recording; keep it from reacting to playback speed
+        governor_enabled, quality.enabled = quality.enabled, False
+        frame_times = []
+        divergence = None
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                game.asset_manager.set_player_character(header['character'])
+                random.seed(header['seed'])
+                game_clock.reset()
+                state = game.new_gameplay()
+                state.player.controller = self.replay_input
+
+            for tick, ms in enumerate(replay.frame_ms):
+                self.tick = tick
+                if tick in levels:
+                    quality.set_level(levels[tick])
+                events = []
+                while next_spawn and next_spawn[0] == tick:
+                    events.append(pygame.event.Event(ENEMY_SPAWN_EVENT, {
+                        'enemy_type': enemy_types[next_spawn[2]],
+                        'packet_type': packet_types[next_spawn[1]],
+                        'source': 'network'
+                    }))
+                    next_spawn = next(spawns, None)
+
+                dt = ms / 1000.0
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    state.handle_events(events)
+                    game_clock.advance(dt)
+                    state.update(dt)
+                    if draw:
+                        state.draw(game.screen)
+                frame_times.append(time.perf_counter() - start)
+                if on_frame:
+                    on_frame(tick, state)
+
+                if divergence is None and tick in checksums and state_checksum(state) != checksums[tick]:
+                    divergence = tick
+        finally:
+            quality.enabled = governor_enabled
+            quality.set_level(0)
+        return frame_times, divergence
+
+
+def main(argv=None):
+    import argparse
+    from src.benchmark import summarize
+    from src.headless import HeadlessGame
+    from src.tracing import tracer
+    parser = argparse.ArgumentParser(description="Play back a recorded Striker 1945 session headless and uncapped")
+    parser.add_argument('replay', help="replay file (recorded with STRIKER_RECORD=<dir>)")
+    parser.add_argument('--no-draw', action='store_true', help="skip drawing")
+    parser.add_argument('--profile', metavar='FILE', help="write cProfile stats of the playback to FILE")
+    parser.add_argument('--trace', metavar='FILE', help="write a span trace of the playback to FILE")
+    parser.add_argument('--slowest', type=int, default=5, help="number of slowest ticks to list")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.replay)
+    header = replay.header
+    size = os.path.getsize(args.replay)
+    print(f"{args.replay}: {replay.ticks} ticks ({sum(replay.frame_ms) / 1000:.1f}s game time), "
+          f"{len(replay.inputs)} input changes, {len(replay.spawns)} network spawns, seed {header['seed']}, "
+          f"{size} bytes")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame()
+    player = ReplayPlayer(game, replay)
+    profile = None
+    if args.profile:
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+    if args.trace:
+        tracer.start()
+    started = time.perf_counter()
+    frame_times, divergence = player.play(draw=not args.no_draw)
+    elapsed = time.perf_counter() - started
+    if profile:
+        profile.disable()
+        profile.dump_stats(args.profile)
+        print(f"Profile written to {args.profile}")
+    if args.trace:
+        tracer.stop()
+        tracer.export(args.trace)
+
+    summary = summarize(frame_times)
+    print(f"Played in {elapsed:.2f}s: frame p50={summary['p50']:.3f}ms p95={summary['p95']:.3f}ms "
+          f"p99={summary['p99']:.3f}ms max={summary['max']:.3f}ms")
+    slowest = sorted(range(len(frame_times)), key=frame_times.__getitem__, reverse=True)[:args.slowest]
+    for tick in slowest:
+        game_time = sum(replay.frame_ms[:tick + 1]) / 1000
+        print(f"  tick {tick:>6} (game time {game_time:.2f}s): {frame_times[tick] * 1000:.3f}ms")
+    if divergence is None:
+        print(f"State checksums: all {len(replay.checksums)} match")
+    else:
+        print(f"State checksums: diverged at tick {divergence}")
+    pygame.quit()
+    return 0 if divergence is None else 1
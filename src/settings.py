@@ -1,10 +1,12 @@
 # Game constants and settings
+import os
 import pygame
 
 # Screen dimensions
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 900
 FPS = 60
+IDLE_FPS = 20  # Frame rate while a static screen (scenario, character selection, menu) waits for input
 
 # Colors (RGB)
 BLACK = (0, 0, 0)
@@ -28,6 +30,35 @@ POWERUP_DROP_CHANCE = 0.1  # 10% chance for an enemy to drop a powerup
 # Game settings
 SCORE_FONT_SIZE = 24
 
+# Collision grid cell size (pixels), about the size of a typical sprite
+COLLISION_CELL_SIZE = 64
+
+# Off-screen culling: margin (pixels) kept around the screen per entity kind
+CULL_MARGINS = {'enemies': 50, 'powerups': 50, 'player_bullets': 0, 'enemy_bullets': 0}
+
+# Rotated sprite cache: angles snap to ROTATION_STEP degrees, least recently used evicted
+ROTATION_STEP = 5
+ROTATION_CACHE_SIZE = 512
+# Angles rotated at load time (player spread shots)
+PRELOADED_ROTATIONS = {'bullet': (-30, -15, 15, 30)}
+
+# Baked asset cache: images stored decoded at their final size, re-baked when a source changes
+ASSET_CACHE_ENABLED = True
+ASSET_CACHE_DIR = os.path.join('assets', '.cache')
+
+# Background asset loading threads (Game); headless tools load synchronously
+ASSET_LOADER_WORKERS = 4
+
+# Sprite atlas: images up to ATLAS_MAX_SPRITE pixels on a side are packed onto shared pages
+ATLAS_PAGE_SIZE = 512
+ATLAS_PADDING = 1  # Transparent pixels between packed sprites
+ATLAS_MAX_SPRITE = 160
+
+# Rendered text cache (HUD, menus), least recently used evicted
+TEXT_CACHE_SIZE = 256
+# Characters pre-rendered for fast-changing numbers (score, health)
+GLYPH_ATLAS_CHARS = '0123456789/-+.,: '
+
 # --- 네트워크 스폰 설정 추가 ---
 # Pygame 커스텀 이벤트 정의
 ENEMY_SPAWN_EVENT = pygame.USEREVENT + 1
@@ -41,4 +72,33 @@ PACKET_TO_ENEMY_MAP = {
 }
 
 # 네트워크 스폰 쿨다운 (초)
-NETWORK_SPAWN_COOLDOWN = 1.0
\ No newline at end of file
+NETWORK_SPAWN_COOLDOWN = 1.0
+
+# --- 메트릭 엔드포인트 (Prometheus 텍스트 포맷) ---
+# 기본은 꺼져 있고, STRIKER_METRICS_PORT 환경 변수로도 켤 수 있습니다.
+METRICS_ENABLED = False
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9145
+
+# --- 더티 렉트 렌더링 (선택 사항) ---
+# 바뀐 영역만 지우고 pygame.display.update(rects)로 내보냅니다. F6 또는
+# STRIKER_DIRTY_RECTS=1 환경 변수로도 켤 수 있습니다.
+DIRTY_RECTS_ENABLED = False
+# 더티 영역이 화면의 이 비율을 넘거나 렉트가 이보다 많으면 전체 flip으로 돌아갑니다
+DIRTY_RECT_AREA_LIMIT = 0.5
+DIRTY_RECT_COUNT_LIMIT = 1500
+
+# --- 적응형 품질 조절 ---
+# 프레임 작업 시간이 예산에 가까워지면 단계적으로 연출을 줄이고, 여유가 생기면 되돌립니다 (F7로 끄고 켜기)
+QUALITY_GOVERNOR_ENABLED = True
+QUALITY_WINDOW = 30  # Frames averaged before each decision
+QUALITY_DEGRADE_AT = 0.9  # Drop a level above this fraction of the frame budget
+QUALITY_RECOVER_AT = 0.6  # Climb back below this fraction...
+QUALITY_HOLD_FRAMES = FPS * 2  # ...once it has stayed there this many frames
+QUALITY_SHIELD_PULSE_MS = 250  # Shield alpha steps this often instead of every frame
+QUALITY_HUD_INTERVAL = 4  # HUD redrawn every N frames
+AUDIO_VOICES = 8  # pygame's default mixer channel count
+QUALITY_AUDIO_VOICES = 4
+
+# --- 웨이브 전환 중 다음 웨이브 미리 준비 ---
+WAVE_PREWARM_STEPS = 8  # Prewarm steps (archetype, rotation set or pooled enemy) per transition frame
@@ -0,0 +1,404 @@
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pygame
+from src.settings import *
+from src.game_clock import game_clock
+from src.benchmark import FRAME_DT, PERCENTILES
+
+# Frame times are pooled across sessions as a histogram of 0.1 ms buckets
+FRAME_BUCKET_MS = 0.1
+
+def frame_histogram(samples):
+    """Counter of frame times (seconds) by FRAME_BUCKET_MS bucket."""
+    return Counter(int(sample * 1000 / FRAME_BUCKET_MS) for sample in samples)
+
+def histogram_percentile(histogram, pct):
+    """Nearest-rank percentile (ms, bucket upper edge) of a frame histogram."""
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    rank = max(1, -(-pct * total // 100))
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= rank:
+            return round((bucket + 1) * FRAME_BUCKET_MS, 4)
+
+
+# --- Traffic sources ---
+class TrafficSource:
+    """
+    Network traffic for a headless session. Packets pass through the same
+    per-type cooldown as NetworkMonitor before they become spawn events, so
+    a flood is throttled the way live traffic is.
+    """
+    name = 'none'
+
+    def __init__(self, seed=0, cooldown=NETWORK_SPAWN_COOLDOWN):
+        self.cooldown = cooldown
+        self.last_spawn_time = dict.fromkeys(PACKET_TO_ENEMY_MAP, float('-inf'))
+        self.admitted = Counter()
+        self.rejected = Counter()
+
+    def packets(self, now, dt):
+        """Packet types that arrived during the last dt seconds."""
+        return ()
+
+    def events(self, now, dt):
+        """Spawn events for this frame, after the cooldown."""
+        events = []
+        for packet_type in self.packets(now, dt):
+            if now - self.last_spawn_time[packet_type] > self.cooldown:
+                self.last_spawn_time[packet_type] = now
+                self.admitted[packet_type] += 1
+                events.append(pygame.event.Event(ENEMY_SPAWN_EVENT, {
+                    'enemy_type': PACKET_TO_ENEMY_MAP[packet_type],
+                    'packet_type': packet_type,
+                    'source': 'network'
+                }))
+            else:
+                self.rejected[packet_type] += 1
+        return events
+
+
+class SyntheticTraffic(TrafficSource):
+    """Poisson arrivals per packet type; rates in packets per second"""
+
+    def __init__(self, seed=0, rates=None, burst_rates=None, period=0.0, burst_length=0.0, name='steady'):
+        super().__init__(seed)
+        self.name = name
+        self.rng = np.random.default_rng(seed)
+        self.rates = rates or {}
+        # During the first burst_length seconds of every period the burst rates apply instead
+        self.burst_rates = burst_rates or self.rates
+        self.period = period
+        self.burst_length = burst_length
+
+    def packets(self, now, dt):
+        bursting = self.period and now % self.period < self.burst_length
+        rates = self.burst_rates if bursting else self.rates
+        packets = []
+        for packet_type, rate in rates.items():
+            packets.extend([packet_type] * int(self.rng.poisson(rate * dt)))
+        return packets
+
+
+class CaptureTraffic(TrafficSource):
+    """Replays a pcap capture at its recorded timing, looping when it runs out"""
+    captures = {}  # path -> [(offset seconds, packet type)], read once per process
+
+    def __init__(self, seed=0, path=None):
+        super().__init__(seed)
+        self.name = f'pcap:{path}'
+        self.arrivals = self.load(path)
+        self.length = self.arrivals[-1][0] + 1.0 if self.arrivals else 0.0
+        self.index = 0
+        self.loop_start = 0.0
+
+    @classmethod
+    def load(cls, path):
+        if path not in cls.captures:
+            from scapy.all import rdpcap  # Only capture replays need scapy
+            from src.network_monitor import classify_packet
+            packets = rdpcap(path)
+            start = float(packets[0].time) if packets else 0.0
+            cls.captures[path] = [(float(packet.time) - start, packet_type) for packet in packets
+                                  if (packet_type := classify_packet(packet))]
+        return cls.captures[path]
+
+    def packets(self, now, dt):
+        packets = []
+        arrivals = self.arrivals
+        while arrivals and self.loop_start + arrivals[self.index][0] <= now:
+            packets.append(arrivals[self.index][1])
+            self.index += 1
+            if self.index == len(arrivals):
+                self.index = 0
+                self.loop_start += self.length
+        return packets
+
+
+# Packet rates (per second) loosely modelled on a busy workstation
+STEADY_RATES = {'tcp': 30.0, 'udp': 8.0, 'icmp': 0.5, 'arp': 0.3}
+BURST_RATES = {'tcp': 400.0, 'udp': 120.0, 'icmp': 20.0, 'arp': 5.0}
+
+TRAFFIC_SOURCES = {
+    'none': lambda seed: TrafficSource(seed),
+    'steady': lambda seed: SyntheticTraffic(seed, STEADY_RATES, name='steady'),
+    'burst': lambda seed: SyntheticTraffic(seed, STEADY_RATES, BURST_RATES, period=20.0, burst_length=5.0, name='burst'),
+}
+
+def create_traffic(spec, seed):
+    """Traffic source from a name in TRAFFIC_SOURCES or 'pcap:<file>'."""
+    if spec.startswith('pcap:'):
+        return CaptureTraffic(seed, spec[len('pcap:'):])
+    return TRAFFIC_SOURCES[spec](seed)
+
+
+# --- Autopilots ---
+class Autopilot:
+    """Player controller for headless sessions; holds fire and stays put"""
+
+    def __init__(self, state, rng):
+        self.state = state
+        self.rng = rng
+        self.home_y = SCREEN_HEIGHT - 100
+
+    def __call__(self, player):
+        return 0, self.toward(player.pos.y, self.home_y), True
+
+    def toward(self, value, target, deadzone=8):
+        if value < target - deadzone:
+            return 1
+        if value > target + deadzone:
+            return -1
+        return 0
+
+
+class SweepAutopilot(Autopilot):
+    """Sweeps side to side along the bottom of the screen"""
+
+    def __init__(self, state, rng):
+        super().__init__(state, rng)
+        self.heading = rng.choice((-1, 1))
+
+    def __call__(self, player):
+        if player.rect.left <= 0:
+            self.heading = 1
+        elif player.rect.right >= SCREEN_WIDTH:
+            self.heading = -1
+        return self.heading, self.toward(player.pos.y, self.home_y), True
+
+
+class DodgeAutopilot(Autopilot):
+    """
+    Steps away from enemy bullets, enemies and warning points in a band
+    above the player; otherwise lines up under the lowest enemy.
+    """
+    lookahead = 150  # Pixels above the player that count as incoming
+    margin = 50  # Horizontal reach of a threat beyond the player's half width
+
+    def __call__(self, player):
+        state = self.state
+        x, y = player.pos
+        reach = player.rect.width / 2 + self.margin
+        threats = []
+
+        bullets = state.enemy_bullets
+        n = bullets.count
+        if n:
+            bx, by = bullets.pos[:n, 0], bullets.pos[:n, 1]
+            near = (np.abs(bx - x) < reach) & (by > y - self.lookahead) & (by < y + player.rect.height)
+            threats.extend(bx[near].tolist())
+        for sprite in (*state.enemy_group, *state.hazard_group):
+            sx, sy = sprite.rect.center
+            if abs(sx - x) < reach + sprite.rect.width / 2 and y - self.lookahead < sy < y + player.rect.height:
+                threats.append(sx)
+
+        if threats:
+            center = sum(threats) / len(threats)
+            move_x = -1 if center > x else 1
+            # Turn around at the edges instead of pinning against them
+            if (move_x < 0 and player.rect.left <= 0) or (move_x > 0 and player.rect.right >= SCREEN_WIDTH):
+                move_x = -move_x
+        else:
+            enemies = state.enemy_group.sprites()
+            target = max(enemies, key=lambda enemy: enemy.rect.bottom).rect.centerx if enemies else SCREEN_WIDTH / 2
+            move_x = self.toward(x, target)
+        return move_x, self.toward(y, self.home_y), True
+
+
+AUTOPILOTS = {
+    'idle': Autopilot,
+    'sweep': SweepAutopilot,
+    'dodge': DodgeAutopilot,
+}
+
+
+# --- Sessions ---
+worker_game = None  # HeadlessGame of this worker process
+
+def init_worker():
+    """Process pool initializer: one headless game per worker, reused for its sessions."""
+    global worker_game
+    from src.headless import HeadlessGame
+    with contextlib.redirect_stdout(io.StringIO()):
+        worker_game = HeadlessGame()
+
+def run_session(seed, traffic_spec, autopilot, max_frames, draw=True):
+    """Play one headless GameplayState until the player dies, wins or max_frames pass."""
+    if worker_game is None:
+        init_worker()
+    game = worker_game
+    started = time.perf_counter()
+    frame_times = []
+
+    # Spawns, boss phases and network events print to stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        random.seed(seed)
+        game_clock.reset()
+        state = game.new_gameplay()
+        player = state.player
+        player.controller = AUTOPILOTS[autopilot](state, random.Random(seed))
+        traffic = create_traffic(traffic_spec, seed)
+        peak_entities = state.entity_counts()
+        peak_total = 0
+
+        frame = 0
+        while frame < max_frames and not (player.is_dead or state.game_won):
+            game_clock.advance(FRAME_DT)
+            events = traffic.events(game_clock.time, FRAME_DT)
+            start = time.perf_counter()
+            state.handle_events(events)
+            state.update(FRAME_DT)
+            if draw:
+                state.draw(game.screen)
+            frame_times.append(time.perf_counter() - start)
+            frame += 1
+
+            counts = state.entity_counts()
+            for key, count in counts.items():
+                if count > peak_entities[key]:
+                    peak_entities[key] = count
+            peak_total = max(peak_total, sum(counts.values()) - counts['all_sprites'])
+
+    histogram = frame_histogram(frame_times)
+    outcome = 'died' if player.is_dead else 'won' if state.game_won else 'timeout'
+    return {
+        'seed': seed,
+        'traffic': traffic_spec,
+        'autopilot': autopilot,
+        'outcome': outcome,
+        'survival_wave': state.wave_manager.current_wave,
+        'score': state.score,
+        'damage_taken': player.damage_taken,
+        'lives_lost': 3 - player.lives,
+        'game_seconds': round(frame * FRAME_DT, 2),
+        'wall_seconds': round(time.perf_counter() - started, 2),
+        'peak_entities': peak_entities,
+        'peak_entity_total': peak_total,
+        'network_spawns': {'admitted': dict(traffic.admitted), 'rejected': dict(traffic.rejected)},
+        'frame_ms': {f"p{pct}": histogram_percentile(histogram, pct) for pct in PERCENTILES},
+        'frame_histogram': histogram,
+    }
+
+
+# --- Report ---
+def spread(values):
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        'mean': round(sum(ordered) / len(ordered), 2),
+        'min': ordered[0],
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1],
+    }
+
+def aggregate(sessions):
+    """Summary of a group of session results."""
+    frames = Counter()
+    for session in sessions:
+        frames.update(session['frame_histogram'])
+    return {
+        'sessions': len(sessions),
+        'outcomes': dict(Counter(session['outcome'] for session in sessions)),
+        'survival_wave': spread([session['survival_wave'] for session in sessions]),
+        'waves_reached': dict(sorted(Counter(session['survival_wave'] for session in sessions).items())),
+        'damage_taken': spread([session['damage_taken'] for session in sessions]),
+        'score': spread([session['score'] for session in sessions]),
+        'peak_entity_total': spread([session['peak_entity_total'] for session in sessions]),
+        'frame_ms': {f"p{pct}": histogram_percentile(frames, pct) for pct in PERCENTILES},
+        'frames': sum(frames.values()),
+    }
+
+def build_report(sessions, meta):
+    sessions = sorted(sessions, key=lambda session: session['seed'])
+    groups = {'all': sessions}
+    for key in ('traffic', 'autopilot'):
+        for value in sorted({session[key] for session in sessions}):
+            groups[f"{key}={value}"] = [session for session in sessions if session[key] == value]
+    summary = {name: aggregate(group) for name, group in groups.items()}
+    for session in sessions:
+        session['frame_histogram'] = {str(bucket): count for bucket, count in sorted(session['frame_histogram'].items())}
+    return {'meta': meta, 'summary': summary, 'sessions': sessions}
+
+def print_report(report):
+    print(f"{'group':<24}{'n':>5}{'died':>6}{'won':>5}{'t/o':>5}{'wave p50':>10}{'dmg mean':>10}"
+          f"{'peak ent':>10}" + ''.join(f"{'p' + str(p) + ' ms':>10}" for p in PERCENTILES))
+    for name, summary in report['summary'].items():
+        outcomes = summary['outcomes']
+        print(f"{name:<24}{summary['sessions']:>5}{outcomes.get('died', 0):>6}{outcomes.get('won', 0):>5}"
+              f"{outcomes.get('timeout', 0):>5}{summary['survival_wave']['p50']:>10}"
+              f"{summary['damage_taken']['mean']:>10.0f}{summary['peak_entity_total']['max']:>10}"
+              + ''.join(f"{summary['frame_ms'][f'p{p}']:>10.1f}" for p in PERCENTILES))
+    waves = report['summary']['all']['waves_reached']
+    print("waves reached: " + "  ".join(f"{wave}: {count}" for wave, count in waves.items()))
+
+
+def run_batch(sessions, seed=1, traffic=('none', 'steady', 'burst'), autopilots=('dodge',),
+              minutes=5.0, workers=None, draw=True):
+    """
+    Run `sessions` headless sessions across a process pool. Session i gets
+    seed + i and cycles through the traffic sources, then the autopilots.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_frames = int(minutes * 60 * FPS)
+    specs = [(seed + i, traffic[i % len(traffic)], autopilots[(i // len(traffic)) % len(autopilots)])
+             for i in range(sessions)]
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        futures = [executor.submit(run_session, *spec, max_frames, draw) for spec in specs]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            print(f"[{done}/{sessions}] seed {result['seed']} {result['traffic']}/{result['autopilot']}: "
+                  f"{result['outcome']} on wave {result['survival_wave']} after {result['game_seconds']:.0f}s "
+                  f"({result['wall_seconds']:.1f}s wall)", flush=True)
+    meta = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'workers': workers,
+        'wall_seconds': round(time.perf_counter() - started, 2),
+        'max_game_minutes': minutes,
+        'draw': draw,
+    }
+    return build_report(results, meta)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Striker 1945 batch simulator")
+    parser.add_argument('--sessions', type=int, default=32, help="number of headless sessions")
+    parser.add_argument('--seed', type=int, default=1, help="seed of the first session (others count up)")
+    parser.add_argument('--traffic', default='none,steady,burst',
+                        help=f"comma-separated traffic sources ({', '.join(TRAFFIC_SOURCES)} or pcap:<file>)")
+    parser.add_argument('--autopilot', default='dodge', help=f"comma-separated autopilots ({', '.join(AUTOPILOTS)})")
+    parser.add_argument('--minutes', type=float, default=5.0, help="game minutes before a session times out")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: every core)")
+    parser.add_argument('--no-draw', action='store_true', help="skip drawing (frame times then cover update only)")
+    parser.add_argument('--output', default='sim_report.json', help="where to write the JSON report")
+    args = parser.parse_args(argv)
+
+    traffic = args.traffic.split(',')
+    autopilots = args.autopilot.split(',')
+    unknown = [name for name in traffic if name not in TRAFFIC_SOURCES and not name.startswith('pcap:')]
+    unknown += [name for name in autopilots if name not in AUTOPILOTS]
+    if unknown:
+        parser.error(f"unknown traffic source or autopilot: {', '.join(unknown)}")
+
+    report = run_batch(args.sessions, args.seed, traffic, autopilots, args.minutes, args.workers, not args.no_draw)
+    print_report(report)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {os.path.abspath(args.output)}")
@@ -1,8 +1,12 @@
+import math
 import pygame
 from src.settings import *
+from src.quality import quality
+from src.game_clock import game_clock
+from src.events import PLAYER_HIT, POWERUP_EXPIRED
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, pos, asset_manager, screen_rect):
+    def __init__(self, pos, asset_manager, screen_rect, events=None):
         super().__init__()
         
         # Image and rect
@@ -40,60 +44,91 @@ class Player(pygame.sprite.Sprite):
         self.has_spread_shot = False
         self.shield_health = 0
         self.shield_image = None
+        self.shield_alpha = None  # Alpha last set on shield_image
         
-        # Sprite groups will be set by the game state
-        self.all_sprites = None
-        self.bullet_group = None
+        # Bullet system will be set by the game state
+        self.bullets = None
+        self.bullet_image_ids = {}  # angle -> image id in the bullet system
         
-    def set_sprite_groups(self, all_sprites, bullet_group):
-        """Set sprite groups for bullet spawning"""
-        self.all_sprites = all_sprites
-        self.bullet_group = bullet_group
+        # Input comes from the keyboard unless a controller (autopilot) is set:
+        # a callable taking the player and returning (move_x, move_y, fire)
+        self.controller = None
         
-    def get_input(self):
-        """Handle player input"""
+        # Health lost to hits, for simulation reports
+        self.damage_taken = 0
+        
+        # EventBus for hits and expiring power-ups (None: nobody is listening)
+        self.events = events
+        
+    def set_bullet_system(self, bullets):
+        """Set the bullet system that player shots are emitted into"""
+        self.bullets = bullets
+        self.bullet_image_ids = {}
+        
+    def read_keys(self):
+        """Keyboard state as (move_x, move_y, fire); move_x/move_y are -1, 0 or 1"""
         keys = pygame.key.get_pressed()
+        move_x = int(keys[pygame.K_RIGHT] or keys[pygame.K_d]) - int(keys[pygame.K_LEFT] or keys[pygame.K_a])
+        move_y = int(keys[pygame.K_DOWN] or keys[pygame.K_s]) - int(keys[pygame.K_UP] or keys[pygame.K_w])
+        return move_x, move_y, bool(keys[pygame.K_SPACE])
+        
+    def get_input(self):
+        """Handle player input from the keyboard, or from the controller when one is set"""
+        move_x, move_y, fire = self.controller(self) if self.controller else self.read_keys()
         
         # Movement input
-        self.direction.x = int(keys[pygame.K_RIGHT] or keys[pygame.K_d]) - int(keys[pygame.K_LEFT] or keys[pygame.K_a])
-        self.direction.y = int(keys[pygame.K_DOWN] or keys[pygame.K_s]) - int(keys[pygame.K_UP] or keys[pygame.K_w])
+        self.direction.x = move_x
+        self.direction.y = move_y
         
         # Normalize direction to prevent faster diagonal movement
         if self.direction.magnitude() != 0:
             self.direction = self.direction.normalize()
             
         # Shooting input
-        if keys[pygame.K_SPACE]:
+        if fire:
             self.shoot()
             
     def shoot(self):
         """Create bullets based on weapon level or active power-ups"""
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         if current_time - self.last_shot_time > self.shoot_delay:
             self.last_shot_time = current_time
             
             # Check for spread shot power-up
             if self.has_spread_shot:
                 # 3-way spread shot, distinct from weapon level
-                Bullet(self.rect.midtop, self.asset_manager, [self.all_sprites, self.bullet_group], angle=0)
-                Bullet(self.rect.center, self.asset_manager, [self.all_sprites, self.bullet_group], angle=-30)
-                Bullet(self.rect.center, self.asset_manager, [self.all_sprites, self.bullet_group], angle=30)
+                self.fire(self.rect.midtop, angle=0)
+                self.fire(self.rect.center, angle=-30)
+                self.fire(self.rect.center, angle=30)
             elif self.weapon_level == 1:
                 # Single bullet from center
-                Bullet(self.rect.midtop, self.asset_manager, [self.all_sprites, self.bullet_group])
+                self.fire(self.rect.midtop)
             elif self.weapon_level == 2:
                 # Two bullets from sides
-                Bullet((self.rect.left + 8, self.rect.top), self.asset_manager, [self.all_sprites, self.bullet_group])
-                Bullet((self.rect.right - 8, self.rect.top), self.asset_manager, [self.all_sprites, self.bullet_group])
+                self.fire((self.rect.left + 8, self.rect.top))
+                self.fire((self.rect.right - 8, self.rect.top))
             elif self.weapon_level >= 3:
                 # Three bullets: center and angled
-                Bullet(self.rect.midtop, self.asset_manager, [self.all_sprites, self.bullet_group])
-                Bullet((self.rect.left + 8, self.rect.top), self.asset_manager, [self.all_sprites, self.bullet_group], angle=-15)
-                Bullet((self.rect.right - 8, self.rect.top), self.asset_manager, [self.all_sprites, self.bullet_group], angle=15)
+                self.fire(self.rect.midtop)
+                self.fire((self.rect.left + 8, self.rect.top), angle=-15)
+                self.fire((self.rect.right - 8, self.rect.top), angle=15)
                 
             # Play shoot sound
             self.asset_manager.play_sound('shoot')
             
+    def fire(self, pos, angle=0):
+        """Emit one bullet; angled bullets use the asset manager's rotation cache"""
+        image_id = self.bullet_image_ids.get(angle)
+        if image_id is None:
+            image = self.asset_manager.get_rotated('bullet', angle)
+            image_id = self.bullets.register_image(('bullet', angle), image)
+            self.bullet_image_ids[angle] = image_id
+            
+        # Convert angle to radians and create angled velocity
+        angle_rad = math.radians(angle)
+        velocity = (math.sin(angle_rad) * BULLET_SPEED, -math.cos(angle_rad) * BULLET_SPEED)
+        self.bullets.emit(pos, velocity, image_id)
+            
     def upgrade_weapon(self):
         """Upgrade weapon level"""
         self.weapon_level += 1
@@ -116,10 +151,13 @@ class Player(pygame.sprite.Sprite):
             return False  # Player doesn't take health damage
             
         self.health -= damage
+        self.damage_taken += damage
+        if self.events:
+            self.events.publish(PLAYER_HIT, player=self, damage=damage)
         
         # Start invulnerability period
         self.invulnerable = True
-        self.invulnerable_time = pygame.time.get_ticks()
+        self.invulnerable_time = game_clock.get_ticks()
         
         # Check if player died
         if self.health <= 0:
@@ -144,7 +182,7 @@ class Player(pygame.sprite.Sprite):
         """Respawn player with full health and invulnerability"""
         self.health = self.max_health
         self.invulnerable = True
-        self.invulnerable_time = pygame.time.get_ticks()
+        self.invulnerable_time = game_clock.get_ticks()
         
         # Reset position to bottom center
         self.pos.x = self.screen_rect.centerx
@@ -198,6 +236,8 @@ class Player(pygame.sprite.Sprite):
         for key in to_remove:
             self.active_effects[key].remove(self)
             del self.active_effects[key]
+            if self.events:
+                self.events.publish(POWERUP_EXPIRED, player=self, powerup_type=key)
         
     def update(self, dt):
         """Update player state"""
@@ -217,62 +257,40 @@ class Player(pygame.sprite.Sprite):
         
         # Update invulnerability
         if self.invulnerable:
-            current_time = pygame.time.get_ticks()
+            current_time = game_clock.get_ticks()
             if current_time - self.invulnerable_time > self.invulnerable_duration:
                 self.invulnerable = False
                 
     def draw(self, screen):
-        """Custom draw method to handle invulnerability flashing and shield"""
+        """Custom draw method to handle invulnerability flashing and shield. Returns the area covered."""
+        area = self.rect.copy()  # update() moves self.rect in place; the renderer keeps this as last frame's area
         # Draw shield
         if self.shield_health > 0 and self.shield_image:
-            # Pulsate shield alpha for visual effect
-            alpha = 128 + int((pygame.time.get_ticks() % 1000) / 1000 * 127)
-            self.shield_image.set_alpha(alpha)
-            shield_rect = self.shield_image.get_rect(center=self.rect.center)
-            screen.blit(self.shield_image, shield_rect)
+            if quality.static_shield:
+                # Fixed translucency baked into the pixels: much cheaper to blit than surface alpha on top of per-pixel alpha
+                shield_image = self.asset_manager.get_tinted(self.shield_image, 'translucent')
+            else:
+                # Pulsate shield alpha for visual effect (in coarser steps when the quality governor asks)
+                ticks = game_clock.get_ticks()
+                if quality.shield_pulse_ms:
+                    ticks -= ticks % quality.shield_pulse_ms
+                alpha = 128 + int((ticks % 1000) / 1000 * 127)
+                if alpha != self.shield_alpha:
+                    self.shield_image.set_alpha(alpha)
+                    self.shield_alpha = alpha
+                shield_image = self.shield_image
+            shield_rect = shield_image.get_rect(center=self.rect.center)
+            screen.blit(shield_image, shield_rect)
+            area = area.union(shield_rect)
         
         if self.invulnerable:
             # Flash every 100ms during invulnerability
-            current_time = pygame.time.get_ticks()
+            current_time = game_clock.get_ticks()
             if (current_time // 100) % 2 == 0:
                 screen.blit(self.image, self.rect)
         else:
             screen.blit(self.image, self.rect)
-
-
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, pos, asset_manager, groups, angle=0):
-        super().__init__(groups)
-        
-        # Image and rect
-        self.image = asset_manager.get_image('bullet')
-        if angle != 0:
-            self.image = pygame.transform.rotate(self.image, angle)
-        self.rect = self.image.get_rect(center=pos)
-        
-        # Movement
-        self.pos = pygame.math.Vector2(self.rect.center)
-        
-        # Calculate velocity based on angle
-        if angle == 0:
-            self.velocity = pygame.math.Vector2(0, -BULLET_SPEED)
-        else:
-            # Convert angle to radians and create angled velocity
-            import math
-            angle_rad = math.radians(angle)
-            self.velocity = pygame.math.Vector2(
-                math.sin(angle_rad) * BULLET_SPEED,
-                -math.cos(angle_rad) * BULLET_SPEED
-            )
-            
-    def update(self, dt):
-        """Update bullet position"""
-        self.pos += self.velocity * dt
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
-        
-        # Remove bullet when it goes off screen
-        if self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT or self.rect.right < 0 or self.rect.left > SCREEN_WIDTH:
-            self.kill()
+        return area
 
 
 class Enemy(pygame.sprite.Sprite):
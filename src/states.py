@@ -2,21 +2,55 @@ import pygame
 from src.settings import *
 from src.sprites import Player
 from src.enemy import Enemy
-from src.attack_patterns import EnemyBullet
+from src.bullets import BulletSystem
+from src.pools import SpritePool
+from src.movement_patterns import MovementBatch
+from src.culling import CullingPass
+from src.archetypes import ArchetypeRegistry
 from src.wave_manager import WaveManager
 from src.powerups import PowerUp
+from src.quality import quality
+from src.replay import ReplayRecorder
+from src.events import WAVE_STARTED, BOSS_SPAWNED, BOSS_DEFEATED, PLAYER_HIT
 import random
 
 class State:
+    idle = False  # True when the screen only changes on input; Game.run then ticks at IDLE_FPS
     def __init__(self, game): self.game = game
     def handle_events(self, events): pass
     def update(self, dt): pass
     def draw(self, screen): pass
+    def entity_counts(self): return {}
+    def pool_stats(self): return {}
+    def cull_stats(self): return {}
 
-class ScenarioState(State):
+class StaticScreenState(State):
+    """
+    State whose screen only changes on input. The static content is
+    composed once into a full-screen surface and blitted each frame;
+    invalidate() after a page or selection change, and draw anything that
+    moves in draw_dynamic().
+    """
+    idle = True
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.background = None
+
+    def invalidate(self): self.background = None
+    def compose(self, surface): pass
+    def draw_dynamic(self, screen): pass
+
+    def draw(self, screen):
+        if self.background is None:
+            self.background = pygame.Surface(screen.get_size())
+            self.compose(self.background)
+        screen.blit(self.background, (0, 0))
+        self.draw_dynamic(screen)
+
+class ScenarioState(StaticScreenState):
     def __init__(self, game):
         super().__init__(game)
-        self.font = self.game.asset_manager.get_font('score')
         self.pages = [
             ["BoB 14th - The Final Project", "", "BoB 14기 보안제품개발 트랙의 마지막 과제 제출일.", "하지만 평화로운 코딩은 끝났다."],
             ["수백만 줄의 레거시 코드 속에서 깨어난", "정체불명의 AI, '길길 코드(GilGil Code)'가", "시스템 전체에 반란을 일으켰다."],
@@ -31,30 +65,28 @@ class ScenarioState(State):
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
-                    if self.current_page < self.last_page: self.current_page += 1
+                    if self.current_page < self.last_page: self.current_page += 1; self.invalidate()
                     else: self.game.state_manager.change_state('character_selection')
                 elif event.key == pygame.K_ESCAPE: self.game.running = False
 
-    def draw(self, screen):
+    def compose(self, screen):
         screen.fill(BLACK)
+        assets = self.game.asset_manager
         current_text_lines = self.pages[self.current_page]
         y_offset = SCREEN_HEIGHT // 2 - (len(current_text_lines) * 40) // 2
         for line in current_text_lines:
-            text_surf = self.font.render(line, True, WHITE)
+            text_surf = assets.get_text('score', line)
             text_rect = text_surf.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
             screen.blit(text_surf, text_rect); y_offset += 40
             
         continue_text = "Press SPACE to continue..."
-        continue_surf = self.font.render(continue_text, True, YELLOW)
+        continue_surf = assets.get_text('score', continue_text, YELLOW)
         continue_rect = continue_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100))
         screen.blit(continue_surf, continue_rect)
 
-class CharacterSelectionState(State):
+class CharacterSelectionState(StaticScreenState):
     def __init__(self, game):
         super().__init__(game)
-        self.title_font = self.game.asset_manager.get_font('title')
-        self.font = self.game.asset_manager.get_font('score')
-        
         self.character_keys = ['player1', 'player2', 'player3', 'player4']
         self.character_names = {
             'player1': "더불어 민재", 'player2': "국민의 민재",
@@ -77,17 +109,18 @@ class CharacterSelectionState(State):
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RIGHT: self.selected_index = (self.selected_index + 1) % len(self.character_keys)
-                elif event.key == pygame.K_LEFT: self.selected_index = (self.selected_index - 1 + len(self.character_keys)) % len(self.character_keys)
+                if event.key == pygame.K_RIGHT: self.selected_index = (self.selected_index + 1) % len(self.character_keys); self.invalidate()
+                elif event.key == pygame.K_LEFT: self.selected_index = (self.selected_index - 1 + len(self.character_keys)) % len(self.character_keys); self.invalidate()
                 elif event.key in [pygame.K_SPACE, pygame.K_RETURN]:
                     selected_key = self.character_keys[self.selected_index]
                     self.game.asset_manager.set_player_character(selected_key)
                     self.game.state_manager.change_state('menu')
                 elif event.key == pygame.K_ESCAPE: self.game.running = False
 
-    def draw(self, screen):
+    def compose(self, screen):
         screen.fill(BLACK)
-        title_text = self.title_font.render("CHOOSE YOUR CHARACTER", True, WHITE)
+        assets = self.game.asset_manager
+        title_text = assets.get_text('title', "CHOOSE YOUR CHARACTER")
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         screen.blit(title_text, title_rect)
         
@@ -98,76 +131,193 @@ class CharacterSelectionState(State):
 
             name_text = self.character_names.get(key, "")
             color = YELLOW if i == self.selected_index else WHITE
-            name_surf = self.font.render(name_text, True, color)
+            name_surf = assets.get_text('score', name_text, color)
             name_rect = name_surf.get_rect(center=(rect.centerx, rect.bottom + 40))
             screen.blit(name_surf, name_rect)
 
-        selection_rect = self.character_rects[self.selected_index].inflate(20, 20)
-        pygame.draw.rect(screen, WHITE, selection_rect, 5)
-
-        instructions_text = self.font.render("좌우 방향키로 선택, 스페이스바로 확정", True, WHITE)
+        instructions_text = assets.get_text('score', "좌우 방향키로 선택, 스페이스바로 확정")
         instructions_rect = instructions_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100))
         screen.blit(instructions_text, instructions_rect)
 
+    def draw_dynamic(self, screen):
+        selection_rect = self.character_rects[self.selected_index].inflate(20, 20)
+        pygame.draw.rect(screen, WHITE, selection_rect, 5)
+
 class GameplayState(State):
     def __init__(self, game):
         super().__init__(game)
         self.all_sprites = pygame.sprite.Group()
         self.player_group = pygame.sprite.Group()
-        self.bullet_group = pygame.sprite.Group()
         self.enemy_group = pygame.sprite.Group()
-        self.enemy_bullet_group = pygame.sprite.Group()
         self.powerup_group = pygame.sprite.Group()
+        self.hazard_group = pygame.sprite.Group()  # Boss area attacks (WarningPoint)
+        
+        # Gameplay uses every sprite and sound; the atlas must not be packed here while the loader still packs it
+        game.asset_manager.wait_for('images')
+        game.asset_manager.wait_for('sounds')
+        
+        # Bullets are not sprites; they live in array-backed bullet systems
+        screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        atlas = game.asset_manager.atlas
+        self.player_bullets = BulletSystem(screen_rect, atlas=atlas)
+        self.enemy_bullets = BulletSystem(screen_rect, capacity=1024, atlas=atlas)
+        
+        # Wave, boss and player events go through the game's bus to the HUD, audio and metrics
+        self.events = game.events
         
         player_pos = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100)
-        self.player = Player(player_pos, game.asset_manager, pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.player.set_sprite_groups(self.all_sprites, self.bullet_group)
+        self.player = Player(player_pos, game.asset_manager, screen_rect, self.events)
+        self.player.set_bullet_system(self.player_bullets)
         self.all_sprites.add(self.player); self.player_group.add(self.player)
         
+        # Replay recording (STRIKER_RECORD=<dir>) seeds random and resets the game clock,
+        # so it starts before the wave manager draws any random numbers
+        replay_dir = getattr(game, 'replay_dir', None)
+        self.recorder = ReplayRecorder(self, replay_dir) if replay_dir else None
+        
         self.score = 0; self.game_won = False
-        self.is_boss_active = False
-        sprite_groups = [self.all_sprites, self.enemy_group, self.enemy_bullet_group]
-        self.wave_manager = WaveManager(game.asset_manager, self.player, sprite_groups)
+        sprite_groups = [self.all_sprites, self.enemy_group]
+        
+        # Killed enemies and power-ups are recycled instead of rebuilt
+        self.enemy_pool = SpritePool('enemies', self.create_enemy, sprite_groups)
+        self.powerup_pool = SpritePool('powerups', self.create_powerup, [self.all_sprites, self.powerup_group])
+        
+        # Enemy types compiled once into archetypes for cheap spawning
+        self.archetypes = ArchetypeRegistry(game.asset_manager)
+        # Closed-form enemy movement is stepped in bulk before the sprites update
+        self.movement_batch = MovementBatch()
+        # Off-screen entities are removed in one pass after the sprites update
+        self.culling = CullingPass(screen_rect)
+        
+        # HUD cache used while the quality governor lowers the HUD update rate
+        self.hud_surface = None
+        self.hud_rects = []  # Areas of hud_surface the last redraw covered
+        self.hud_frames = 0  # Frames left before the cached HUD is redrawn
         
-    def spawn_powerup(self, pos): PowerUp(pos, self.game.asset_manager, [self.all_sprites, self.powerup_group])
+        # Kept current by events instead of polling the wave manager every frame
+        self.wave_title = ''
+        self.boss = None  # Boss whose health bar is drawn
+        self.events.subscribe(WAVE_STARTED, self.on_wave_started)
+        self.events.subscribe(BOSS_SPAWNED, self.on_boss_spawned)
+        self.events.subscribe(BOSS_DEFEATED, self.on_boss_defeated)
+        self.events.subscribe(PLAYER_HIT, self.on_player_hit)
+        
+        self.wave_manager = WaveManager(game.asset_manager, self.player, sprite_groups, self.enemy_bullets, self.hazard_group, self.enemy_pool, self.archetypes, self.events)
+        
+    def create_enemy(self, pos, archetype):
+        return Enemy(pos, archetype, self.player, [self.all_sprites, self.enemy_group], self.enemy_bullets, self.hazard_group)
+    
+    def create_powerup(self, pos): return PowerUp(pos, self.game.asset_manager, [self.all_sprites, self.powerup_group])
+        
+    def spawn_powerup(self, pos): self.powerup_pool.acquire(pos)
         
     def handle_events(self, events):
         for event in events:
-            if event.type == ENEMY_SPAWN_EVENT and event.source == 'network': self.spawn_network_enemy(event.enemy_type)
+            if event.type == ENEMY_SPAWN_EVENT and event.source == 'network':
+                if self.recorder: self.recorder.record_spawn(event.packet_type, event.enemy_type)
+                self.spawn_network_enemy(event.enemy_type)
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE: self.game.running = False
                 elif event.key == pygame.K_r and (self.player.is_dead or self.game_won): self.game.state_manager.change_state('gameplay')
     
+    def on_wave_started(self, wave_number, max_waves, name, is_boss_wave):
+        self.wave_title = f"Wave {wave_number}/{max_waves}: {name}"
+        self.hud_frames = 0  # A cached HUD shows the new wave right away
+        if not is_boss_wave:
+            self.boss = None  # Never carry a boss health bar into a regular wave
+        
+    def on_boss_spawned(self, boss): self.boss = boss
+    
+    def on_boss_defeated(self, boss): self.boss = None
+    
+    def on_player_hit(self, player, damage):
+        self.hud_frames = 0  # The health bar drops on the hit, not on the next HUD redraw
+    
     def spawn_network_enemy(self, enemy_type):
         spawn_pos = (random.randint(50, SCREEN_WIDTH - 50), random.randint(-100, -50))
-        Enemy(spawn_pos, enemy_type, self.game.asset_manager, self.player, [self.all_sprites, self.enemy_group])
+        self.enemy_pool.acquire(spawn_pos, self.archetypes.get(enemy_type))
         print(f"Spawning '{enemy_type}' at {spawn_pos} from network event.")
         
+    def entity_counts(self):
+        """Live sprite counts per group, for the profiler and benchmarks"""
+        return {
+            'all_sprites': len(self.all_sprites),
+            'enemies': len(self.enemy_group),
+            'player_bullets': len(self.player_bullets),
+            'enemy_bullets': len(self.enemy_bullets),
+            'powerups': len(self.powerup_group),
+            'hazards': len(self.hazard_group),
+        }
+    
+    def cull_stats(self):
+        """Entities removed off screen per kind: last frame and since the state started"""
+        return self.culling.stats()
+    
+    def pool_stats(self):
+        """Object pool usage (bullet systems are array pools with the same counters)"""
+        return {
+            'enemies': self.enemy_pool.stats(),
+            'powerups': self.powerup_pool.stats(),
+            'player_bullets': self.player_bullets.stats(),
+            'enemy_bullets': self.enemy_bullets.stats(),
+        }
+        
     def update(self, dt):
-        if self.game_won or self.player.is_dead: return
+        if self.game_won or self.player.is_dead:
+            self.end_recording()
+            return
+        profiler = self.game.profiler
+        profiler.begin('sprites_update')
+        self.movement_batch.update(dt, self.enemy_group)
         self.all_sprites.update(dt)
+        self.player_bullets.update(dt)
+        self.enemy_bullets.update(dt)
+        self.cull_offscreen()
+        profiler.end('sprites_update')
+        profiler.begin('wave_update')
         self.wave_manager.update(dt)
-        wave_info = self.wave_manager.get_wave_info()
-        # 1. 보스가 나타났을 때
-        if wave_info['is_boss_wave'] and wave_info['boss_enemy']:
-           if not self.is_boss_active:
-               self.is_boss_active = True
-               if pygame.mixer.get_init():  # 믹서가 초기화되었는지 확인
-                   pygame.mixer.music.stop() # 보스가 나타나면 기존 BGM 정지
-
-       # 2. 보스를 물리쳤을 때
-        elif self.is_boss_active and not wave_info['boss_enemy']:
-           self.is_boss_active = False
-           self.game.play_bgm() # 보스가 사라지면 BGM 다시 재생
+        profiler.end('wave_update')
         
         # Check for victory condition
-        if self.wave_manager.get_wave_info()['all_waves_complete']: self.game_won = True
+        if self.wave_manager.all_waves_complete: self.game_won = True
+        profiler.begin('collisions')
         self.check_collisions()
+        profiler.end('collisions')
+        if self.recorder: self.recorder.end_tick(dt)
+    
+    def close(self):
+        """Called when a new gameplay session replaces this one"""
+        self.end_recording()
+        self.events.unsubscribe_all(self)
+    
+    def end_recording(self):
+        """Write the replay of this session, if it is being recorded"""
+        if self.recorder:
+            self.recorder.save()
+            self.recorder = None
+        
+    def cull_offscreen(self):
+        culling = self.culling
+        # The boss enters from above the screen and is never culled
+        culling.cull_sprites('enemies', self.enemy_group, exclude=self.wave_manager.boss_enemy)
+        culling.cull_sprites('powerups', self.powerup_group)
+        culling.cull_bullets('player_bullets', self.player_bullets)
+        culling.cull_bullets('enemy_bullets', self.enemy_bullets)
         
     def check_collisions(self):
-        hits = pygame.sprite.groupcollide(self.bullet_group, self.enemy_group, True, False)
-        for bullet, enemies in hits.items():
-            for enemy in enemies:
+        # 플레이어 한 명 대 그룹은 spritecollide로 바로 검사합니다 (매 프레임 격자를 만드는 것보다 빠름);
+        # 격자는 다수 대 다수인 총알 충돌에만 씁니다
+        # Player vs blue screen warning points (before a boss kill can clear them)
+        if self.hazard_group:
+            for point in pygame.sprite.spritecollide(self.player, self.hazard_group, False):
+                point.hit(self.player)
+            for point in self.hazard_group.sprites():
+                if point.expired: point.kill()
+        
+        # Player bullets vs enemies, paired through the bullet grid
+        hits = self.player_bullets.collide_sprites(self.enemy_group)
+        for enemy, bullet_hits in hits.items():
+            for _ in range(bullet_hits):
                 if enemy.take_damage():
                     self.score += enemy.get_score_value()
                     if random.random() < POWERUP_DROP_CHANCE: self.spawn_powerup(enemy.rect.center)
@@ -179,35 +329,93 @@ class GameplayState(State):
             hits[0].kill() # Remove one enemy on contact
             
         # Player vs enemy bullets
-        if pygame.sprite.spritecollide(self.player, self.enemy_bullet_group, True) and not self.player.invulnerable:
+        if self.enemy_bullets.collide_rect(self.player.rect) and not self.player.invulnerable:
             self.player.take_damage(15)
         
         # Player vs power-ups
-        for powerup in pygame.sprite.spritecollide(self.player, self.powerup_group, True):
-            self.player.add_powerup(powerup.powerup_type)
+        if self.powerup_group:
+            for powerup in pygame.sprite.spritecollide(self.player, self.powerup_group, False):
+                powerup.kill()
+                self.player.add_powerup(powerup.powerup_type)
             
     def draw(self, screen):
-        screen.fill(BLACK)
+        profiler = self.game.profiler
+        profiler.begin('draw')
+        # 더티 렉트 모드에서는 지난 프레임에 그린 영역만 지우고, 그린 영역을 모두 기록합니다
+        renderer = self.game.renderer
+        renderer.begin(screen)
+        dirty = renderer.current if renderer.enabled else None
+        # 아틀라스에 들어간 이미지는 아틀라스 페이지의 해당 영역에서 그립니다
+        atlas_areas = self.game.asset_manager.atlas.areas
+        blits = []
         for sprite in self.all_sprites:
-            if sprite != self.player: screen.blit(sprite.image, sprite.rect)
-        self.player.draw(screen)
-        self.draw_ui(screen)
-        wave_info = self.wave_manager.get_wave_info()
-        if wave_info['is_boss_wave'] and wave_info['boss_enemy']:
-            wave_info['boss_enemy'].draw_health_bar(screen)
+            if sprite is self.player:
+                continue
+            image = sprite.image
+            packed = atlas_areas.get(image)
+            blits.append((packed[0], sprite.rect, packed[1]) if packed else (image, sprite.rect))
+        sprite_rects = screen.blits(blits, doreturn=dirty is not None)
+        self.enemy_bullets.draw(screen, dirty)
+        self.player_bullets.draw(screen, dirty)
+        player_rect = self.player.draw(screen)
+        if dirty is not None:
+            dirty.extend(sprite_rects)
+            dirty.append(player_rect)
+        profiler.end('draw')
+        profiler.begin('draw_ui')
+        renderer.add_many(self.draw_ui(screen))
+        if self.boss:
+            renderer.add(self.boss.draw_health_bar(screen))
+        profiler.end('draw_ui')
         
     # --- 여기가 복원된 draw_ui 메서드 ---
     def draw_ui(self, screen):
-        """Draw user interface"""
-        font = self.game.asset_manager.get_font('score')
+        """Draw user interface and return the rects it covered"""
+        # 품질 조절기가 HUD 갱신 주기를 늘리면 캐시해 둔 HUD를 붙여 넣기만 합니다
+        if quality.hud_interval > 1:
+            drawn = self.draw_cached_hud(screen)
+        else:
+            drawn = self.draw_hud(screen)
+        
+        # Game over screen
+        if self.player.is_dead:
+            self.draw_game_over(screen)
+            drawn.append(screen.get_rect())
+        elif self.game_won:
+            self.draw_game_success(screen)
+            drawn.append(screen.get_rect())
+        return drawn
+    
+    def draw_cached_hud(self, screen):
+        """Blit the HUD from a surface redrawn every quality.hud_interval frames"""
+        if self.hud_frames <= 0:
+            if self.hud_surface is None:
+                # Opaque with a black color key: much cheaper to blit than per-pixel alpha
+                self.hud_surface = pygame.Surface((SCREEN_WIDTH // 2, 220)).convert()
+                self.hud_surface.set_colorkey(BLACK)
+            self.hud_surface.fill(BLACK)
+            bounds = self.hud_surface.get_rect()
+            self.hud_rects = [rect.clip(bounds) for rect in self.draw_hud(self.hud_surface)]
+            self.hud_frames = quality.hud_interval
+        self.hud_frames -= 1
+        hud = self.hud_surface
+        return screen.blits([(hud, rect, rect) for rect in self.hud_rects])
+        
+    def draw_hud(self, screen):
+        """Draw score, health and wave info and return the rects covered"""
+        # 텍스트는 캐시에서 가져오고, 자주 바뀌는 숫자(점수, 체력)는 글리프 아틀라스로 그립니다
+        assets = self.game.asset_manager
+        digits = assets.get_glyphs('score')
+        drawn = []
         
         # Draw score
-        score_text = font.render(f"Score: {self.score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
+        score_label = assets.get_text('score', "Score: ")
+        drawn.append(screen.blit(score_label, (10, 10)))
+        drawn.append(digits.draw(screen, str(self.score), (10 + score_label.get_width(), 10)))
         
         # Draw weapon level
-        weapon_text = font.render(f"Weapon: {self.player.weapon_level}", True, WHITE)
-        screen.blit(weapon_text, (10, 40))
+        weapon_text = assets.get_text('score', f"Weapon: {self.player.weapon_level}")
+        drawn.append(screen.blit(weapon_text, (10, 40)))
         
         # Draw health bar
         health_bar_width, health_bar_height, health_x, health_y = 200, 20, 10, 70
@@ -217,93 +425,96 @@ class GameplayState(State):
         health_width = int(health_bar_width * health_percent)
         if health_width > 0:
             pygame.draw.rect(screen, (0, 200, 0), (health_x, health_y, health_width, health_bar_height))
-        pygame.draw.rect(screen, WHITE, health_bg_rect, 2)
-        screen.blit(font.render(f"Health: {self.player.health}/{self.player.max_health}", True, WHITE), (health_x + health_bar_width + 10, health_y))
+        drawn.append(pygame.draw.rect(screen, WHITE, health_bg_rect, 2))
+        health_label = assets.get_text('score', "Health: ")
+        drawn.append(screen.blit(health_label, (health_x + health_bar_width + 10, health_y)))
+        drawn.append(digits.draw(screen, f"{self.player.health}/{self.player.max_health}",
+                                 (health_x + health_bar_width + 10 + health_label.get_width(), health_y)))
         
         # Draw lives
-        screen.blit(font.render(f"Lives: {self.player.lives}", True, WHITE), (10, 100))
+        drawn.append(screen.blit(assets.get_text('score', f"Lives: {self.player.lives}"), (10, 100)))
         
         # Draw wave information
-        wave_info = self.wave_manager.get_wave_info()
-        wave_text = font.render(f"Wave {wave_info['wave_number']}/{wave_info['max_waves']}: {wave_info['wave_name']}", True, WHITE)
-        screen.blit(wave_text, (10, 130))
+        wave_manager = self.wave_manager
+        drawn.append(screen.blit(assets.get_text('score', self.wave_title), (10, 130)))
         
-        if not wave_info['is_boss_wave']:
+        if not wave_manager.is_boss_wave:
             # Regular wave info
-            enemies_text = font.render(f"Enemies: {wave_info['enemies_alive']} active, {wave_info['enemies_remaining']} remaining", True, WHITE)
-            screen.blit(enemies_text, (10, 160))
+            remaining = max(0, wave_manager.enemies_to_spawn - wave_manager.enemies_spawned)
+            enemies_text = assets.get_text('score', f"Enemies: {len(self.enemy_group)} active, {remaining} remaining")
+            drawn.append(screen.blit(enemies_text, (10, 160)))
             
             # Wave progress bar
-            if wave_info['wave_active']:
+            if wave_manager.wave_active:
                 progress_x, progress_y, progress_width, progress_height = 10, 190, 200, 15
                 progress_bg = pygame.Rect(progress_x, progress_y, progress_width, progress_height)
                 pygame.draw.rect(screen, (50, 50, 50), progress_bg)
-                progress_percent = wave_info['progress'] / 100
+                progress_percent = wave_manager.get_wave_progress() / 100
                 progress_fill_width = int(progress_width * progress_percent)
                 if progress_fill_width > 0:
                     pygame.draw.rect(screen, (0, 150, 255), (progress_x, progress_y, progress_fill_width, progress_height))
-                pygame.draw.rect(screen, WHITE, progress_bg, 2)
-        
-        # Game over screen
-        if self.player.is_dead:
-            self.draw_game_over(screen)
-        elif self.game_won:
-            self.draw_game_success(screen)
+                drawn.append(pygame.draw.rect(screen, WHITE, progress_bg, 2))
+        return drawn
             
     def draw_game_over(self, screen):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 128))
         screen.blit(overlay, (0,0))
-        title_font = self.game.asset_manager.get_font('title')
-        score_font = self.game.asset_manager.get_font('score')
-        text = title_font.render("GAME OVER", True, WHITE)
+        assets = self.game.asset_manager
+        text = assets.get_text('title', "GAME OVER")
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 50)))
-        text = score_font.render(f"Final Score: {self.score}", True, WHITE)
+        text = assets.get_text('score', f"Final Score: {self.score}")
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2)))
-        text = score_font.render("Press R to restart or ESC to quit", True, WHITE)
+        text = assets.get_text('score', "Press R to restart or ESC to quit")
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 50)))
     
     def draw_game_success(self, screen):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 128))
         screen.blit(overlay, (0,0))
-        title_font = self.game.asset_manager.get_font('title')
-        score_font = self.game.asset_manager.get_font('score')
-        text = title_font.render("VICTORY!", True, GREEN)
+        assets = self.game.asset_manager
+        text = assets.get_text('title', "VICTORY!", GREEN)
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 80)))
-        text = score_font.render("Congratulations! You saved the galaxy!", True, YELLOW)
+        text = assets.get_text('score', "Congratulations! You saved the galaxy!", YELLOW)
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 30)))
 
-class MenuState(State):
+class MenuState(StaticScreenState):
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE: self.game.state_manager.change_state('gameplay')
                 elif event.key == pygame.K_ESCAPE: self.game.running = False
                     
-    def draw(self, screen):
+    def compose(self, screen):
         screen.fill(BLACK)
-        title_font = self.game.asset_manager.get_font('title')
-        score_font = self.game.asset_manager.get_font('score')
-        text = title_font.render("STRIKER 1945", True, WHITE)
+        assets = self.game.asset_manager
+        text = assets.get_text('title', "STRIKER 1945")
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 50)))
-        text = score_font.render("Press SPACE to start", True, WHITE)
+        text = assets.get_text('score', "Press SPACE to start")
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 50)))
-        text = score_font.render("Press ESC to quit", True, WHITE)
+        text = assets.get_text('score', "Press ESC to quit")
         screen.blit(text, text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 80)))
 
 class StateManager:
+    STATE_CLASSES = {
+        'scenario': ScenarioState,
+        'character_selection': CharacterSelectionState,
+        'menu': MenuState,
+        'gameplay': GameplayState
+    }
+    
     def __init__(self, game):
         self.game = game
-        self.states = {
-            'scenario': ScenarioState(game),
-            'character_selection': CharacterSelectionState(game),
-            'menu': MenuState(game),
-            'gameplay': GameplayState(game)
-        }
+        # States are built the first time they are entered, so the scenario
+        # screen shows while the rest of the assets are still loading
+        self.states = {'scenario': ScenarioState(game)}
         self.current_state = self.states['scenario']
         
     def change_state(self, state_name):
-        if state_name in self.states:
-            if state_name == 'gameplay': self.states['gameplay'] = GameplayState(self.game)
+        if state_name in self.STATE_CLASSES:
+            if state_name == 'gameplay' and 'gameplay' in self.states:
+                self.states['gameplay'].close()
+                del self.states['gameplay']
+            if state_name not in self.states:
+                self.states[state_name] = self.STATE_CLASSES[state_name](self.game)
             self.current_state = self.states[state_name]
\ No newline at end of file
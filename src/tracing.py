@@ -0,0 +1,147 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Set this to a file path to trace from startup (asset loading included)
+TRACE_ENV_VAR = 'STRIKER_TRACE'
+
+class _NullSpan:
+    """Shared do-nothing span handed out while tracing is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Context manager that records one complete ('X') trace event"""
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer.buffer().append(('X', self.name, self.category, self.start, end - self.start, self.args))
+        return False
+
+
+class Tracer:
+    """
+    Collects spans into per-thread buffers and exports them as Chrome Trace
+    Event JSON (loadable in chrome://tracing and ui.perfetto.dev).
+
+    Each thread appends to its own buffer without taking a lock, so the
+    game loop and the packet sniffer thread never wait on each other here.
+    """
+
+    def __init__(self, max_events_per_thread=500000):
+        self.enabled = False
+        self.max_events_per_thread = max_events_per_thread
+        self.local = threading.local()
+        self.buffers = []  # (thread id, thread name, events)
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter_ns()
+
+    def buffer(self):
+        events = getattr(self.local, 'events', None)
+        if events is None:
+            events = deque(maxlen=self.max_events_per_thread)
+            thread = threading.current_thread()
+            with self.lock:
+                self.buffers.append((threading.get_native_id(), thread.name, events))
+            self.local.events = events
+        return events
+
+    def start(self):
+        """Clear previous spans and start recording."""
+        with self.lock:
+            for _, _, events in self.buffers:
+                events.clear()
+        self.origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def span(self, name, category='game', **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category, args or None)
+
+    def instant(self, name, category='game', **args):
+        """Record a point-in-time ('i') event, e.g. a boss phase change."""
+        if self.enabled:
+            self.buffer().append(('i', name, category, time.perf_counter_ns(), 0, args or None))
+
+    def counter(self, name, **values):
+        """Record a counter ('C') event; each keyword becomes a series."""
+        if self.enabled:
+            self.buffer().append(('C', name, 'counter', time.perf_counter_ns(), 0, values))
+
+    def traced(self, name=None, category='game'):
+        """Decorator form of span(); the name defaults to Class.method."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name, category, None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def to_chrome_trace(self):
+        """Build the Chrome Trace Event document from all thread buffers."""
+        pid = os.getpid()
+        trace_events = []
+        with self.lock:
+            buffers = [(tid, thread_name, list(events)) for tid, thread_name, events in self.buffers]
+        for tid, thread_name, events in buffers:
+            trace_events.append({'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}})
+            for phase, name, category, start, duration, args in events:
+                event = {
+                    'ph': phase, 'name': name, 'cat': category, 'pid': pid, 'tid': tid,
+                    'ts': (start - self.origin) / 1000,  # microseconds
+                }
+                if phase == 'X':
+                    event['dur'] = duration / 1000
+                elif phase == 'i':
+                    event['s'] = 't'
+                if args:
+                    event['args'] = args
+                trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path=None):
+        """Write the collected spans to a trace JSON file and return its path."""
+        path = path or time.strftime('trace_%Y%m%d_%H%M%S.json')
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+        print(f"Trace written to {path}")
+        return path
+
+
+# Shared tracer used across the game
+tracer = Tracer()
+span = tracer.span
+instant = tracer.instant
+traced = tracer.traced
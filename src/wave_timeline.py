@@ -0,0 +1,59 @@
+import random
+from src.settings import *
+
+def row_x(index, per_row, spacing):
+    """x of slot `index` in rows of per_row enemies, centered on the screen."""
+    return (SCREEN_WIDTH - (per_row - 1) * spacing) // 2 + (index % per_row) * spacing
+
+def spawn_position(pattern, index, rng=random):
+    """Spawn position of the index-th enemy of a wave with the given pattern."""
+    if pattern == 'formation':
+        # Rows of 7, stacked upward
+        return row_x(index, 7, 80), -50 - (index // 7) * 60
+    if pattern == 'waves':
+        # Horizontal waves of 8
+        return row_x(index, 8, 90), -50 - (index // 8) * 80
+    if pattern == 'mixed' and index % 3:
+        # Every third enemy of a mixed wave spawns at random, the rest in a row of 6
+        return row_x(index, 6, 100), -50
+    return rng.randint(50, SCREEN_WIDTH - 50), rng.randint(-100, -50)
+
+
+class WaveTimeline:
+    """
+    A wave config compiled into its spawn schedule.
+
+    Entries are (time, enemy type, position) tuples sorted by time, with
+    time in milliseconds after the wave starts. The enemy order is
+    shuffled once at compile time, which draws the same distribution as
+    picking a random remaining enemy on every spawn.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.next = 0  # Index of the next entry to spawn
+
+    @classmethod
+    def compile(cls, config, rng=random):
+        enemy_types = [enemy_type for enemy_type, count in config['enemies'].items() for _ in range(count)]
+        rng.shuffle(enemy_types)
+        delay = config.get('spawn_delay', 1000)
+        pattern = config.get('spawn_pattern', 'random')
+        return cls([(index * delay, enemy_type, spawn_position(pattern, index, rng))
+                    for index, enemy_type in enumerate(enemy_types)])
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def remaining(self):
+        return len(self.entries) - self.next
+
+    def due(self, elapsed):
+        """Entries scheduled up to `elapsed` ms that have not spawned yet; several when a frame ran long."""
+        start = end = self.next
+        entries = self.entries
+        while end < len(entries) and entries[end][0] <= elapsed:
+            end += 1
+        self.next = end
+        return entries[start:end]